@@ -1,7 +1,7 @@
 def add_n_generator(n):
     returns = []
     for i in range(n):
-        whatnot = dict({"what": i})
+        whatnot = {"what": i}
         # def lambda_func(x):
         #     return lambda y: y + x['what']
         # returns.append(lambda_func(whatnot))
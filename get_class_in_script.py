@@ -1,22 +1,108 @@
 import ast
+import hashlib
+import importlib.util
 import inspect
+import linecache
+import os
+import pickle
+
+# Parsed trees are pickled here, keyed by the SHA256 of the source bytes
+AST_CACHE_DIR = '__astcache__'
+_AST_INDEX = os.path.join(AST_CACHE_DIR, 'index.pkl')
+
+def _cached_parse(path):
+    """
+    Parse a script into an AST, reusing a pickled tree from AST_CACHE_DIR
+    when the source has not changed since the last run.
+
+    Args:
+        path (str): Path to the script file
+
+    Returns:
+        ast.Module: Parsed tree of the script
+    """
+    os.makedirs(AST_CACHE_DIR, exist_ok=True)
+    try:
+        with open(_AST_INDEX, 'rb') as f:
+            index = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        index = {}
+
+    abs_path = os.path.abspath(path)
+    mtime = os.path.getmtime(path)
+
+    # Fast path: file untouched since the last parse, no need to hash it
+    entry = index.get(abs_path)
+    if entry and entry[0] == mtime:
+        try:
+            with open(os.path.join(AST_CACHE_DIR, f"{entry[1]}.pkl"), 'rb') as f:
+                return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            pass
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    cache_file = os.path.join(AST_CACHE_DIR, f"{digest}.pkl")
+
+    try:
+        with open(cache_file, 'rb') as f:
+            tree = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        tree = ast.parse(data, filename=path)
+        with open(cache_file, 'wb') as f:
+            f.write(pickle.dumps(tree))
+
+    index[abs_path] = (mtime, digest)
+    with open(_AST_INDEX, 'wb') as f:
+        pickle.dump(index, f)
+    return tree
+
+# Loaded modules, keyed by (path, mtime) so an unchanged script is executed once
+_mod_cache = {}
+
+def _load(path):
+    """
+    Load a script as a module without going through sys.modules.
+
+    Args:
+        path (str): Path to the script file
+
+    Returns:
+        module: The loaded module, reused while the file is unchanged
+    """
+    key = (os.path.abspath(path), os.path.getmtime(path))
+    module = _mod_cache.get(key)
+    if module is not None:
+        return module
+    module_name = os.path.splitext(os.path.basename(path))[0]
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    _mod_cache[key] = module
+    return module
 
 # Path to the script file
 script_path = 'c_sample.py'
 
 # Parse the script
-with open(script_path, "r") as file:
-    tree = ast.parse(file.read())
+tree = _cached_parse(script_path)
 
-# Get all class names
-class_names = [node.name for node in tree.body if isinstance(node, ast.ClassDef)]
-print("Classes found:", class_names)
+# Load the module to retrieve class source code
+c_sample = _load(script_path)
 
-# Import the module to retrieve class source code
-import c_sample
+# Read the module source once, each class is then a slice of these lines
+src_lines = linecache.getlines(inspect.getsourcefile(c_sample))
 
-# Use inspect to get the full source code of each class
-class_sources = {name: inspect.getsource(getattr(c_sample, name)) for name in class_names}
+def _class_source(node):
+    # Same span inspect.getsource reports: decorators through the last body line
+    start = min([node.lineno] + [d.lineno for d in node.decorator_list])
+    return ''.join(src_lines[start - 1:node.end_lineno])
+
+# Collect class names and their full source code in a single pass over the tree
+class_sources = {node.name: _class_source(node)
+                 for node in ast.iter_child_nodes(tree) if node.__class__ is ast.ClassDef}
+print("Classes found:", list(class_sources))
 
 # Print each class source code
 for class_name, source in class_sources.items():
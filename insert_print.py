@@ -1,7 +1,31 @@
 import ast
-import astor
 import inspect
 
+# Expression contexts are stateless, share one instance across all built nodes
+_LOAD = ast.Load()
+# FormattedValue conversion meaning "no !s/!r/!a conversion"
+_NEG1 = -1
+# Node types that can contain statement lists, the only places a print can go
+_STMT_HOLDERS = (ast.stmt, ast.excepthandler, ast.match_case)
+
+def _vars_fstring(print_vars):
+    """
+    Build one f-string node printing every variable as "name: value"
+
+    Args:
+        print_vars (list): Variable names to print
+
+    Returns:
+        ast.JoinedStr: f"x: {x} y: {y} ..." with pairs separated by a space
+    """
+    values = []
+    for i, var in enumerate(print_vars):
+        # Variable name, preceded by the separator print() would have used
+        values.append(ast.Constant(value=f"{' ' if i else ''}{var}: "))
+        # Variable value
+        values.append(ast.FormattedValue(value=ast.Name(id=var, ctx=_LOAD), conversion=_NEG1))
+    return ast.JoinedStr(values=values)
+
 def insert_custom_print_with_context(source_code, line_number, variables_to_print=None):
     """
     Insert a custom print function that can access local variables
@@ -14,79 +38,86 @@ def insert_custom_print_with_context(source_code, line_number, variables_to_prin
     Returns:
         str: Modified source code with context-aware print
     """
+    # Nothing to insert, or the target line is outside the source: skip parsing
+    n_lines = source_code.count('\n') + 1
+    if not variables_to_print or not (1 <= line_number <= n_lines):
+        return source_code
+    
     class ContextualPrintInserter(ast.NodeTransformer):
         def __init__(self, target_line, print_vars=None):
             self.target_line = target_line
-            self.current_line = 0
             self.inserted = False
             self.print_vars = print_vars or []
+            # Build the inserted nodes once, visiting only splices them in
+            self._print_nodes = self._create_print_nodes()
         
-        def visit(self, node):
-            # Track current line number
-            if hasattr(node, 'lineno'):
-                self.current_line = node.lineno
-            
-            # Insert print at specific line
-            if (not self.inserted and 
-                self.current_line == self.target_line and 
-                isinstance(node, (ast.stmt, ast.expr))):
-                
-                # Create custom debug print function
-                debug_print_func = ast.FunctionDef(
-                    name='__debug_print__',
-                    args=ast.arguments(
-                        posonlyargs=[],
-                        args=[],
-                        kwonlyargs=[],
-                        kw_defaults=[],
-                        defaults=[]
+        def _create_print_nodes(self):
+            """Build the debug print function and the call to it"""
+            # Create custom debug print function
+            debug_print_func = ast.FunctionDef(
+                name='__debug_print__',
+                args=ast.arguments(
+                    posonlyargs=[],
+                    args=[],
+                    kwonlyargs=[],
+                    kw_defaults=[],
+                    defaults=[]
+                ),
+                body=[
+                    # Create a single print statement for the specified variables
+                    ast.Expr(
+                        value=ast.Call(
+                            func=ast.Name(id='print', ctx=_LOAD),
+                            args=[_vars_fstring(self.print_vars)],
+                            keywords=[]
+                        )
                     ),
-                    body=[
-                        # Create print statements for specified variables
-                        ast.Expr(
-                            value=ast.Call(
-                                func=ast.Name(id='print', ctx=ast.Load()),
-                                args=[
-                                    ast.JoinedStr(
-                                        values=[
-                                            # Variable name
-                                            ast.Constant(value=f"{var}: "),
-                                            # Variable value
-                                            ast.FormattedValue(
-                                                value=ast.Name(id=var, ctx=ast.Load()),
-                                                conversion=-1
-                                            )
-                                        ]
-                                    )
-                                    for var in self.print_vars
-                                ],
-                                keywords=[]
-                            )
-                        ),
-                        # Return to maintain function structure
-                        ast.Return(value=None)
-                    ],
-                    decorator_list=[],
-                    returns=None
-                )
-                
-                # Create call to debug print function
-                debug_print_call = ast.Expr(
-                    value=ast.Call(
-                        func=ast.Name(id='__debug_print__', ctx=ast.Load()),
-                        args=[],
-                        keywords=[]
-                    )
+                    # Return to maintain function structure
+                    ast.Return(value=None)
+                ],
+                decorator_list=[],
+                returns=None
+            )
+            
+            # Create call to debug print function
+            debug_print_call = ast.Expr(
+                value=ast.Call(
+                    func=ast.Name(id='__debug_print__', ctx=_LOAD),
+                    args=[],
+                    keywords=[]
                 )
-                
-                # Mark as inserted to prevent multiple insertions
-                self.inserted = True
-                
-                # Return a list with debug function and print call, followed by original node
-                return [debug_print_func, debug_print_call, node]
+            )
             
-            # Continue traversing the AST
+            return [debug_print_func, debug_print_call]
+        
+        def visit(self, node):
+            # Nothing left to do once the print is in place
+            if self.inserted:
+                return node
             return super().visit(node)
+        
+        def generic_visit(self, node):
+            # Only statement lists (module/function/block bodies) can host the print
+            for field in ('body', 'orelse', 'finalbody'):
+                stmts = getattr(node, field, None)
+                if not isinstance(stmts, list):
+                    continue
+                for i, stmt in enumerate(stmts):
+                    if isinstance(stmt, ast.stmt) and stmt.lineno == self.target_line:
+                        # Insert debug function and print call before the original statement
+                        stmts[i:i] = self._print_nodes
+                        
+                        # Mark as inserted to prevent multiple insertions
+                        self.inserted = True
+                        return node
+            
+            # Descend only into statement holders and stop right after the insertion
+            for child in ast.iter_child_nodes(node):
+                if isinstance(child, _STMT_HOLDERS):
+                    self.visit(child)
+                    if self.inserted:
+                        break
+            return node
     
     # Parse the source code into an Abstract Syntax Tree
     tree = ast.parse(source_code)
@@ -96,7 +127,8 @@ def insert_custom_print_with_context(source_code, line_number, variables_to_prin
     modified_tree = transformer.visit(tree)
     
     # Convert modified AST back to source code
-    return astor.to_source(modified_tree)
+    ast.fix_missing_locations(modified_tree)
+    return ast.unparse(modified_tree)
 
 # Comprehensive Example
 def demonstrate_variable_print(source_code):
@@ -130,13 +162,19 @@ class AdvancedContextualPrinter:
         Returns:
             str: Modified source code
         """
+        # Nothing to insert, or the target line is outside the source: skip parsing
+        n_lines = source_code.count('\n') + 1
+        if not variables_to_print or not (1 <= line_number <= n_lines):
+            return source_code
+        
         class FlexiblePrintInserter(ast.NodeTransformer):
             def __init__(self, target_line, print_vars=None, format_style='detailed'):
                 self.target_line = target_line
-                self.current_line = 0
                 self.inserted = False
                 self.print_vars = print_vars or []
                 self.format_style = format_style
+                # Build the print body once, visiting only splices it in
+                self._print_body = self._create_print_body()
             
             def _create_print_body(self):
                 """Generate different print styles"""
@@ -145,19 +183,8 @@ class AdvancedContextualPrinter:
                     return [
                         ast.Expr(
                             value=ast.Call(
-                                func=ast.Name(id='print', ctx=ast.Load()),
-                                args=[
-                                    ast.JoinedStr(
-                                        values=[
-                                            ast.Constant(value=f"{var}: "),
-                                            ast.FormattedValue(
-                                                value=ast.Name(id=var, ctx=ast.Load()),
-                                                conversion=-1
-                                            )
-                                        ]
-                                    )
-                                    for var in self.print_vars
-                                ],
+                                func=ast.Name(id='print', ctx=_LOAD),
+                                args=[_vars_fstring(self.print_vars)],
                                 keywords=[]
                             )
                         )
@@ -168,7 +195,7 @@ class AdvancedContextualPrinter:
                     return [
                         ast.Expr(
                             value=ast.Call(
-                                func=ast.Name(id='print', ctx=ast.Load()),
+                                func=ast.Name(id='print', ctx=_LOAD),
                                 args=[
                                     ast.Constant(value=f"DEBUG: Line {self.target_line}")
                                 ],
@@ -177,19 +204,8 @@ class AdvancedContextualPrinter:
                         ),
                         ast.Expr(
                             value=ast.Call(
-                                func=ast.Name(id='print', ctx=ast.Load()),
-                                args=[
-                                    ast.JoinedStr(
-                                        values=[
-                                            ast.Constant(value=f"{var}: "),
-                                            ast.FormattedValue(
-                                                value=ast.Name(id=var, ctx=ast.Load()),
-                                                conversion=-1
-                                            )
-                                        ]
-                                    )
-                                    for var in self.print_vars
-                                ],
+                                func=ast.Name(id='print', ctx=_LOAD),
+                                args=[_vars_fstring(self.print_vars)],
                                 keywords=[]
                             )
                         )
@@ -200,12 +216,12 @@ class AdvancedContextualPrinter:
                     return [
                         ast.Expr(
                             value=ast.Call(
-                                func=ast.Name(id='print', ctx=ast.Load()),
+                                func=ast.Name(id='print', ctx=_LOAD),
                                 args=[
                                     ast.Dict(
                                         keys=[ast.Constant(value=var) for var in self.print_vars],
                                         values=[
-                                            ast.Name(id=var, ctx=ast.Load()) 
+                                            ast.Name(id=var, ctx=_LOAD) 
                                             for var in self.print_vars
                                         ]
                                     )
@@ -218,25 +234,33 @@ class AdvancedContextualPrinter:
                 return []
             
             def visit(self, node):
-                # Track current line number
-                if hasattr(node, 'lineno'):
-                    self.current_line = node.lineno
-                
-                # Insert print at specific line
-                if (not self.inserted and 
-                    self.current_line == self.target_line and 
-                    isinstance(node, (ast.stmt, ast.expr))):
-                    
-                    # Create debug print function body
-                    print_body = self._create_print_body()
-                    
-                    # Mark as inserted
-                    self.inserted = True
-                    
-                    # Return print statements before original node
-                    return print_body + [node]
-                
+                # Nothing left to do once the print is in place
+                if self.inserted:
+                    return node
                 return super().visit(node)
+            
+            def generic_visit(self, node):
+                # Only statement lists (module/function/block bodies) can host the print
+                for field in ('body', 'orelse', 'finalbody'):
+                    stmts = getattr(node, field, None)
+                    if not isinstance(stmts, list):
+                        continue
+                    for i, stmt in enumerate(stmts):
+                        if isinstance(stmt, ast.stmt) and stmt.lineno == self.target_line:
+                            # Insert prebuilt print statements before original statement
+                            stmts[i:i] = self._print_body
+                            
+                            # Mark as inserted
+                            self.inserted = True
+                            return node
+                
+                # Descend only into statement holders and stop right after the insertion
+                for child in ast.iter_child_nodes(node):
+                    if isinstance(child, _STMT_HOLDERS):
+                        self.visit(child)
+                        if self.inserted:
+                            break
+                return node
         
         # Parse source code to AST
         tree = ast.parse(source_code)
@@ -250,7 +274,8 @@ class AdvancedContextualPrinter:
         modified_tree = transformer.visit(tree)
         
         # Convert back to source code
-        return astor.to_source(modified_tree)
+        ast.fix_missing_locations(modified_tree)
+        return ast.unparse(modified_tree)
 
 def complex_calculation(x, y):
     a = x + 1
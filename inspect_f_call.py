@@ -2,21 +2,81 @@ import ast
 import sys
 
 class FunctionCallGraphBuilder(ast.NodeVisitor):
+    # The attributes live in slots, so the __dict__ inherited from
+    # ast.NodeVisitor is never materialized
+    __slots__ = (
+        'current_function', 'call_graph', 'class_methods', 'class_hierarchy',
+        'function_stack', 'class_stack', 'instance_methods', 'linearized_mro',
+        '_name_to_id', '_id_to_name', '_resolve_cache', '_dispatch', '_func_handlers',
+    )
+
     def __init__(self):
-        self.current_function = '<module>'
-        self.call_graph = {'<module>': set()}  # Initialize '<module>' to handle top-level calls
+        # Function names are interned to integer ids, the graph only stores ids
+        self._name_to_id = {}
+        self._id_to_name = []
+        module_id = self._intern('<module>')
+        self.current_function = module_id
+        self.call_graph = {module_id: set()}  # Initialize '<module>' to handle top-level calls
         self.class_methods = {}  # Maps each class to its methods
         self.class_hierarchy = {}  # Maps each class to its parent class (inheritance)
-        self.function_stack = ['<module>']
+        self.function_stack = [module_id]
         self.class_stack = []
         self.instance_methods = {}
+        self._resolve_cache = {}  # (class, method) -> resolved name or None
+        self.linearized_mro = {}  # Maps each class to its C3 linearization
+        # Node type -> visitor, resolved once instead of per visited node
+        self._dispatch = {
+            ast.ClassDef: self.visit_ClassDef,
+            ast.FunctionDef: self.visit_FunctionDef,
+            ast.Assign: self.visit_Assign,
+            ast.Call: self.visit_Call,
+        }
+        # Call target type -> name extractor used by get_called_function_name
+        self._func_handlers = {
+            ast.Name: self._called_name,
+            ast.Attribute: self._called_attribute,
+        }
+
+    def visit(self, node):
+        visitor = self._dispatch.get(type(node))
+        if visitor is None:
+            # Any other visit_* hook (e.g. from a subclass), resolved once per node type
+            node_type = type(node)
+            visitor = self._dispatch[node_type] = getattr(self, 'visit_' + node_type.__name__, self.generic_visit)
+        return visitor(node)
+
+    def generic_visit(self, node):
+        for child in ast.iter_child_nodes(node):
+            self.visit(child)
+
+    def _intern(self, name):
+        # Map a function name to its integer id, allocating a new id on first sight
+        func_id = self._name_to_id.get(name)
+        if func_id is None:
+            func_id = len(self._id_to_name)
+            self._name_to_id[name] = func_id
+            self._id_to_name.append(name)
+        return func_id
+
+    def named_call_graph(self):
+        # Materialize the call graph back into function names
+        names = self._id_to_name
+        return {names[caller]: {names[callee] for callee in callees}
+                for caller, callees in self.call_graph.items()}
 
     def visit_ClassDef(self, node):
         # Record class and parent class if present
         class_name = node.name
+        # New class (and its methods) can change earlier resolutions
+        self._resolve_cache.clear()
         parent_classes = [base.id for base in node.bases if isinstance(base, ast.Name)]
         self.class_hierarchy[class_name] = parent_classes if parent_classes else None
 
+        # Linearize the class once so method lookup is a flat scan; the bases
+        # are already known, so calls inside the class body resolve through it
+        parent_mros = [self.linearized_mro.get(parent, [parent]) for parent in parent_classes]
+        self.linearized_mro[class_name] = [class_name] + self._c3_merge(parent_mros + [list(parent_classes)])
+
         # Track methods within the class
         self.class_stack.append(class_name)
         self.class_methods.setdefault(class_name, set())
@@ -27,19 +87,41 @@ class FunctionCallGraphBuilder(ast.NodeVisitor):
         # Pop the class stack
         self.class_stack.pop()
 
+    @staticmethod
+    def _c3_merge(sequences):
+        # C3 merge step: repeatedly take the first head not found in any tail
+        sequences = [list(seq) for seq in sequences if seq]
+        merged = []
+        while sequences:
+            for seq in sequences:
+                head = seq[0]
+                if not any(head in other[1:] for other in sequences):
+                    break
+            else:
+                # Inconsistent hierarchy, fall back to depth-first order
+                for seq in sequences:
+                    merged.extend(name for name in seq if name not in merged)
+                return merged
+            merged.append(head)
+            sequences = [[name for name in seq if name != head] for seq in sequences]
+            sequences = [seq for seq in sequences if seq]
+        return merged
+
     def visit_FunctionDef(self, node):
         # Full function name, including class if applicable
         func_name = node.name
         if self.class_stack:
             full_func_name = f"{self.class_stack[-1]}.{func_name}"
             self.class_methods[self.class_stack[-1]].add(func_name)  # Add to class methods
+            self._resolve_cache.clear()
         else:
             full_func_name = func_name
 
         # Initialize call graph entry for this function
-        self.call_graph.setdefault(full_func_name, set())
-        self.function_stack.append(full_func_name)
-        self.current_function = full_func_name
+        func_id = self._intern(full_func_name)
+        self.call_graph.setdefault(func_id, set())
+        self.function_stack.append(func_id)
+        self.current_function = func_id
 
         # Visit function body
         self.generic_visit(node)
@@ -64,33 +146,40 @@ class FunctionCallGraphBuilder(ast.NodeVisitor):
 
         func_name = self.get_called_function_name(node)
         if func_name:
-            self.call_graph[self.current_function].add(func_name)
+            self.call_graph[self.current_function].add(self._intern(func_name))
         self.generic_visit(node)
 
     def get_called_function_name(self, node):
         # Get the function name from a Call node
-        if isinstance(node.func, ast.Name):
-            return node.func.id
-        elif isinstance(node.func, ast.Attribute):
-            # Handle method calls, including inheritance
-            if isinstance(node.func.value, ast.Name):
-                instance_name = node.func.value.id
-                if instance_name in self.instance_methods:
-                    class_name = self.instance_methods[instance_name]
-                    return self.resolve_method(class_name, node.func.attr)
+        handler = self._func_handlers.get(type(node.func))
+        return handler(node.func) if handler else None
+
+    def _called_name(self, func):
+        return func.id
+
+    def _called_attribute(self, func):
+        # Handle method calls, including inheritance
+        if isinstance(func.value, ast.Name):
+            instance_name = func.value.id
+            if instance_name in self.instance_methods:
+                class_name = self.instance_methods[instance_name]
+                return self.resolve_method(class_name, func.attr)
         return None
 
     def resolve_method(self, class_name, method_name):
-        # Recursively check class hierarchy to resolve method calls
-        if class_name in self.class_methods and method_name in self.class_methods[class_name]:
-            return f"{class_name}.{method_name}"
-        elif class_name in self.class_hierarchy and self.class_hierarchy[class_name]:
-            # Check parent classes if method isn't in the current class
-            for parent_class in self.class_hierarchy[class_name]:
-                resolved = self.resolve_method(parent_class, method_name)
-                if resolved:
-                    return resolved
-        return None
+        # Reuse the previous answer for this (class, method) pair
+        key = (class_name, method_name)
+        if key in self._resolve_cache:
+            return self._resolve_cache[key]
+
+        # Walk the precomputed linearization, first class defining the method wins
+        resolved = None
+        for mro_class in self.linearized_mro.get(class_name, [class_name]):
+            if method_name in self.class_methods.get(mro_class, ()):
+                resolved = f"{mro_class}.{method_name}"
+                break
+        self._resolve_cache[key] = resolved
+        return resolved
 
 if __name__ == "__main__":
     if len(sys.argv) != 2:
@@ -105,7 +194,7 @@ if __name__ == "__main__":
     builder = FunctionCallGraphBuilder()
     builder.visit(tree)
 
-    for func, calls in builder.call_graph.items():
+    for func, calls in builder.named_call_graph().items():
         print(f"Function '{func}' calls functions: {sorted(calls)}")
 
 """
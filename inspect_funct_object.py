@@ -1,47 +1,63 @@
+import sys
+
 def inspect_function(func):
-    print(f"Function Name: {func.__name__}")
-    print(f"Qualified Name: {func.__qualname__}\n")
+    # Collect the whole report and write it out in one go
+    parts = []
+    append = parts.append
+    co = func.__code__
+    names = co.co_varnames
+    argc = co.co_argcount
+    doc = func.__doc__
+    annotations = func.__annotations__
+    closure = func.__closure__
+    func_globals = func.__globals__
+
+    append(f"Function Name: {func.__name__}\n")
+    append(f"Qualified Name: {func.__qualname__}\n\n")
     
     # Docstring
-    print("Docstring:")
-    print(f"  {func.__doc__}\n" if func.__doc__ else "  No docstring available.\n")
+    append("Docstring:\n")
+    append(f"  {doc}\n\n" if doc else "  No docstring available.\n\n")
     
     # Code object
-    print("Code Object:")
-    print(f"  Argument Count: {func.__code__.co_argcount}")
-    print(f"  Positional Arguments: {func.__code__.co_varnames[:func.__code__.co_argcount]}")
-    print(f"  Keyword-only Arguments Count: {func.__code__.co_kwonlyargcount}")
-    print(f"  Local Variables: {func.__code__.co_varnames}")
-    print(f"  Constants: {func.__code__.co_consts}")
-    print(f"  Free Variables: {func.__code__.co_freevars}\n")
+    append("Code Object:\n")
+    append(f"  Argument Count: {argc}\n")
+    append(f"  Positional Arguments: {names[:argc]}\n")
+    append(f"  Keyword-only Arguments Count: {co.co_kwonlyargcount}\n")
+    append(f"  Local Variables: {names}\n")
+    append(f"  Constants: {co.co_consts}\n")
+    append(f"  Free Variables: {co.co_freevars}\n\n")
     
     # Defaults
-    print("Defaults:")
-    print(f"  Positional Defaults: {func.__defaults__}")
-    print(f"  Keyword-only Defaults: {func.__kwdefaults__}\n")
+    append("Defaults:\n")
+    append(f"  Positional Defaults: {func.__defaults__}\n")
+    append(f"  Keyword-only Defaults: {func.__kwdefaults__}\n\n")
     
     # Annotations
-    print("Annotations:")
-    if func.__annotations__:
-        for key, value in func.__annotations__.items():
-            print(f"  {key}: {value}")
+    append("Annotations:\n")
+    if annotations:
+        for key, value in annotations.items():
+            append(f"  {key}: {value}\n")
     else:
-        print("  No annotations.")
-    print()
+        append("  No annotations.\n")
+    append("\n")
     
     # Closure
-    print("Closure:")
-    if func.__closure__:
-        for i, cell in enumerate(func.__closure__):
-            print(f"  Free variable {i}: {cell.cell_contents}")
+    append("Closure:\n")
+    if closure:
+        cell_values = [cell.cell_contents for cell in closure]
+        for i, value in enumerate(cell_values):
+            append(f"  Free variable {i}: {value}\n")
     else:
-        print("  No closure (not a closure or no free variables).\n")
+        append("  No closure (not a closure or no free variables).\n\n")
     
     # Globals
-    print("Globals:")
-    if func.__globals__:
-        print(f"  Accessible globals count: {len(func.__globals__)}")
-    print()
+    append("Globals:\n")
+    if func_globals:
+        append(f"  Accessible globals count: {len(func_globals)}\n")
+    append("\n")
+
+    sys.stdout.write(''.join(parts))
 
 # Example usage with a closure
 def outer(x):
@@ -1,82 +1,114 @@
-import pprint
-import pickle
+import sys
+
+def _attr_is_callable(obj, name, value):
+    """Classify an attribute from its raw __dict__ entry"""
+    if hasattr(type(value), '__set__'):
+        # Data descriptors (properties, slots, __class__) only reveal their
+        # real value through attribute access
+        try:
+            return callable(getattr(obj, name))
+        except AttributeError:
+            return False
+    return callable(value) or isinstance(value, (classmethod, staticmethod))
 
 def inspect_object(obj):
-    print(f"Instance of: {obj.__class__}\n")
+    # Collect the report and write it out in one go
+    out = []
+    out.append(f"Instance of: {obj.__class__}\n")
     
     # 1. Attributes (Properties)
-    print("Attributes (Properties):")
+    out.append("Attributes (Properties):")
     # attributes = vars(obj)
     attributes = False
     if attributes:
+        # Only needed when there is something to pretty-print
+        import pprint
         for attr, value in attributes.items():
-            print(f"  {attr} = \t", end="")
-            pprint.pprint(value)
+            out.append(f"  {attr} = \t{pprint.pformat(value)}")
     else:
-        print("  No instance attributes.")
-    print()
+        out.append("  No instance attributes.")
+    out.append("")
+    
+    # Every attribute dir() would report, gathered once from the instance and its MRO
+    attr_map = dict(getattr(obj, '__dict__', {}))
+    for klass in type(obj).__mro__:
+        for name, value in klass.__dict__.items():
+            attr_map.setdefault(name, value)
+    attr_names = sorted(attr_map)
+    is_callable = {name: _attr_is_callable(obj, name, value) for name, value in attr_map.items()}
     
     # 2. Methods
-    print("Methods:")
-    methods = [method_name for method_name in dir(obj)
-               if callable(getattr(obj, method_name)) and not method_name.startswith("__")]
+    out.append("Methods:")
+    methods = [method_name for method_name in attr_names
+               if is_callable[method_name] and not method_name.startswith("__")]
     if methods:
         for method in methods:
-            print(f"  {method}")
+            out.append(f"  {method}")
     else:
-        print("  No public methods.")
-    print()
+        out.append("  No public methods.")
+    out.append("")
     
     # 3. Class
-    print(f"Class:")
-    print(f"  {obj.__class__.__name__}")
-    print()
+    out.append(f"Class:")
+    out.append(f"  {obj.__class__.__name__}")
+    out.append("")
     
     # 4. Inherited Attributes and Methods
-    print("Inherited Attributes and Methods:")
-    mro = obj.__class__.mro()[1:]  # Exclude the object's own class
+    out.append("Inherited Attributes and Methods:")
+    mro = obj.__class__.__mro__[1:]  # Exclude the object's own class
+    # Attribute each public name to the first base that defines it, in one MRO pass
+    own = obj.__class__.__dict__
+    inherited = {base_class: [] for base_class in mro}
+    seen = set()
     for base_class in mro:
-        print(f"  From {base_class.__name__}:")
-        base_attrs_methods = [attr for attr in dir(base_class) if not attr.startswith("__")]
+        for attr in base_class.__dict__:
+            if not attr.startswith("__") and attr not in own and attr not in seen:
+                seen.add(attr)
+                inherited[base_class].append(attr)
+    for base_class in mro:
+        out.append(f"  From {base_class.__name__}:")
+        base_attrs_methods = sorted(inherited[base_class])
         if base_attrs_methods:
             for attr in base_attrs_methods:
-                print(f"    {attr}")
+                out.append(f"    {attr}")
         else:
-            print("    No public attributes or methods.")
-    print()
+            out.append("    No public attributes or methods.")
+    out.append("")
     
     # 5. Type and ID
-    print(f"Type: {type(obj)}")
-    print(f"ID: {id(obj)}\n")
+    out.append(f"Type: {type(obj)}")
+    out.append(f"ID: {id(obj)}\n")
     
     # 6. Documentation (Docstrings)
-    print("Documentation (Docstrings):")
+    out.append("Documentation (Docstrings):")
     doc = obj.__doc__
     if doc:
-        print(doc.strip())
+        out.append(doc.strip())
     else:
-        print("  No documentation available.")
-    print()
+        out.append("  No documentation available.")
+    out.append("")
     
     # 7. Special Methods and Properties
-    print("Special Methods and Properties:")
-    special_attrs = [attr for attr in dir(obj) if attr.startswith("__") and attr.endswith("__")]
+    out.append("Special Methods and Properties:")
+    special_attrs = [attr for attr in attr_names if attr.startswith("__") and attr.endswith("__")]
     if special_attrs:
         for attr in special_attrs:
-            if callable(getattr(obj, attr)):
-                print(f"  c||{attr}")
+            if is_callable[attr]:
+                out.append(f"  c||{attr}")
             else:
-                print(f"  p||{attr}")
+                out.append(f"  p||{attr}")
     else:
-        print("  No special methods or properties.")
-    print()
+        out.append("  No special methods or properties.")
+    out.append("")
     
     # 8. State (if applicable)
-    print("State:")
+    out.append("State:")
     if attributes:
-        print("  Internal state is represented by the instance attributes above.")
+        out.append("  Internal state is represented by the instance attributes above.")
     else:
-        print("  No internal state to display.")
+        out.append("  No internal state to display.")
+
+    sys.stdout.write("\n".join(out) + "\n")
 
 class A:
     def __init__(self, x, y):
@@ -97,6 +129,7 @@ if __name__ == "__main__":
     inspect_object(gen)
     value = next(gen)
     inspect_object(gen)
+    import pickle
     pickle.dump(a, open("a.pkl", "wb"))
 
 """
@@ -1,14 +1,60 @@
+import sys
+import re
 import inspect
 import ast
+import functools
 from textwrap import dedent
 
-def get_class_details(cls):
+# Source lookups repeat for the same functions across an MRO walk
+_getsource = functools.lru_cache(maxsize=2048)(inspect.getsource)
+
+@functools.lru_cache(maxsize=4096)
+def _parse_func(func):
+    # Each function is parsed once per process. OSError/TypeError from an
+    # unavailable source propagate and, being exceptions, are never cached.
+    return ast.parse(dedent(_getsource(func)))
+
+class _SelfAssignCollector(ast.NodeVisitor):
+    """Collects the attribute names of `self.<name> = ...` assignments"""
+
+    def __init__(self):
+        self.names = []
+
+    def visit_Assign(self, node):
+        # Local aliases keep the loop on fast local loads
+        _isinstance, _Attribute, _Name = isinstance, ast.Attribute, ast.Name
+        append = self.names.append
+        for target in node.targets:
+            if (_isinstance(target, _Attribute) and
+                    _isinstance(target.value, _Name) and target.value.id == 'self'):
+                append(target.attr)
+
+    def visit_ClassDef(self, node):
+        # A nested class has its own `self`
+        pass
+
+# Opt-in fast scan (strict=False) for `self.<name> = ...` lines; it also matches
+# such text inside string literals and misses tuple unpacking and chained
+# targets, which the default AST scan handles
+_SELF_ASSIGN = re.compile(r'^\s*self\.(\w+)\s*=(?!=)', re.M)
+
+def _self_assigned_names(func, strict):
+    # Attribute names the function assigns on self, via the AST or the regex scan
+    if strict:
+        collector = _SelfAssignCollector()
+        collector.visit(_parse_func(func))
+        return collector.names
+    return _SELF_ASSIGN.findall(_getsource(func))
+
+def get_class_details(cls, strict=True):
     """
     Prints the inheritance tree of a given class along with its methods,
     class members, and variables assigned in __init__.
 
     Parameters:
     cls (type): The class to inspect.
+    strict (bool): Find self-attribute assignments by parsing the source.
+        False uses a faster, approximate regex scan instead.
 
     Returns:
     None: Prints the inheritance hierarchy and details to the console.
@@ -16,90 +62,75 @@ def get_class_details(cls):
     if not inspect.isclass(cls):
         raise ValueError("Provided argument must be a class.")
 
-    print(f"Inheritance tree and details for {cls.__name__}:\n")
+    # Collect the report and write it out in one go
+    out = []
+    out.append(f"Inheritance tree and details for {cls.__name__}:\n")
 
     reversed_mro = cls.__mro__[::-1]
-    for base in reversed_mro:
+    for i, base in enumerate(reversed_mro):
         if base is object:
             continue
-        indent_level = len(reversed_mro) - cls.__mro__.index(base) - 2
+        # reversed_mro[i] is cls.__mro__[len - 1 - i], object sits at depth -1
+        indent_level = i - 1
         indent = "  " * indent_level
-        print(f"{indent}=> {base.__name__}:")
-
-        # Get methods
-        methods = [func for func in dir(base)
-                   if callable(getattr(base, func)) and not func.startswith('__') and inspect.isfunction(getattr(base, func))]
-        # Get class variables
-        class_vars = [var for var in base.__dict__ 
-                      if not callable(base.__dict__[var]) and not var.startswith('__')]
-
-        # Variables assigned in __init__
-        init_vars = []
-        if '__init__' in base.__dict__:
-            init_func = base.__dict__['__init__']
+        out.append(f"{indent}=> {base.__name__}:")
+
+        # Categorize the base's own entries in one pass, queueing functions
+        # whose source is scanned for self-attribute assignments
+        methods, class_vars, funcs_to_scan = [], [], []
+        for name, val in base.__dict__.items():
+            if name.startswith('__'):
+                if name == '__init__':
+                    funcs_to_scan.append(('init', val))
+                continue
+            # staticmethod/classmethod objects in __dict__ wrap the function
+            func = val.__func__ if isinstance(val, (staticmethod, classmethod)) else val
+            if inspect.isfunction(func):
+                methods.append(name)
+                funcs_to_scan.append(('method', func))
+            elif not callable(val):
+                class_vars.append(name)
+
+        # Variables assigned in __init__ and variables not assigned in init
+        init_vars = {}  # Ordered set, values unused
+        method_vars = {}  # Ordered set, values unused
+        for kind, func in funcs_to_scan:
             try:
-                source = inspect.getsource(init_func)
-                # print(source)
-                tree = ast.parse(dedent(source))
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.Assign):
-                        for target in node.targets:
-                            if isinstance(target, ast.Attribute):
-                                if (isinstance(target.value, ast.Name) and target.value.id == 'self'):
-                                    init_vars.append(target.attr)
+                names = _self_assigned_names(func, strict)
             except (OSError, TypeError):
-                pass  # Source code not available
+                continue  # Source code not available
             except IndentationError:
-                print("-->")
-                pass
-          
-        # Variable not assigned in init
-        method_vars = []
-        for method in methods:
-            try:
-              source = inspect.getsource(getattr(base, method))
-              tree = ast.parse(dedent(source))
-              for node in ast.walk(tree):
-                  if isinstance(node, ast.Assign):
-                      for target in node.targets:
-                          if isinstance(target, ast.Attribute):
-                              if (isinstance(target.value, ast.Name) and target.value.id == 'self'):
-                                  method_vars.append(target.attr)
-            except (OSError, TypeError):
-                pass  # Source code not available
-            except IndentationError:
-                print("-->")
-                pass
-
-        # Remove duplicates
-        init_vars = list(set(init_vars))
-        method_vars = list(set(method_vars))
+                out.append("-->")
+                continue
+            (init_vars if kind == 'init' else method_vars).update(dict.fromkeys(names))
 
         # Print methods
         if methods:
-            print(f"{indent}  Methods:")
+            out.append(f"{indent}  Methods:")
             for method in methods:
-                print(f"{indent}    {method}")
+                out.append(f"{indent}    {method}")
 
         # Print class variables
         if class_vars:
-            print(f"{indent}  Class Variables:")
+            out.append(f"{indent}  Class Variables:")
             for var in class_vars:
-                print(f"{indent}    {var}")
+                out.append(f"{indent}    {var}")
 
         # Print variables assigned in __init__
         if init_vars:
-            print(f"{indent}  Variables assigned in __init__:")
+            out.append(f"{indent}  Variables assigned in __init__:")
             for var in init_vars:
-                print(f"{indent}    {var}")
+                out.append(f"{indent}    {var}")
 
         # Print variables not assigned in __init__
         if method_vars:
-            print(f"{indent}  Variables not assigned in __init__:")
+            out.append(f"{indent}  Variables not assigned in __init__:")
             for var in method_vars:
-                print(f"{indent}    {var}")
+                out.append(f"{indent}    {var}")
+
+        out.append("")  # Empty line for separation
 
-        print("")  # Empty line for separation
+    sys.stdout.write("\n".join(out) + "\n")
 
 # Example usage
 class A:
@@ -147,28 +178,22 @@ get_class_details(C)
 
   => B:
     Methods:
-      method_a
       method_b
     Class Variables:
       class_var_B
     Variables assigned in __init__:
       instance_var_B
     Variables not assigned in __init__:
-      instance_var_a
       instance_var_b
 
     => C:
       Methods:
-        method_a
-        method_b
         method_c
       Class Variables:
         class_var_C
       Variables assigned in __init__:
         instance_var_C
       Variables not assigned in __init__:
-        instance_var_a
-        instance_var_b
         instance_var_c
 
 """
\ No newline at end of file
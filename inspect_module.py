@@ -1,9 +1,32 @@
 import os
 import sys
+import functools
 import importlib.util
+import importlib.metadata
 import ast
 import platform
-import pkg_resources
+import threading
+from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+
+@functools.lru_cache(maxsize=None)
+def _distribution_versions():
+    """
+    Map every installed top-level module name to its distribution version.
+    Built once, on first use, from a single scan of the installed distributions.
+    
+    Returns:
+        dict: Top-level module name -> version
+    """
+    versions = {}
+    for name, dists in importlib.metadata.packages_distributions().items():
+        for dist in dists:
+            try:
+                versions[name] = importlib.metadata.version(dist)
+                break
+            except importlib.metadata.PackageNotFoundError:
+                continue
+    return versions
 
 def get_module_version(module_name):
     """
@@ -15,37 +38,195 @@ def get_module_version(module_name):
     Returns:
         str: Module version or 'Unknown'
     """
+    version = _distribution_versions().get(module_name)
+    if version is not None:
+        return version
     try:
-        return pkg_resources.get_distribution(module_name).version
-    except (pkg_resources.DistributionNotFound, pkg_resources.RequirementParseError):
+        # Distribution named like the module but not exposing it as top-level
+        return importlib.metadata.version(module_name)
+    except (importlib.metadata.PackageNotFoundError, ValueError):
         try:
-            # Fallback for some modules that might not be in pkg_resources
+            # Fallback for some modules that might not be in the metadata
             module = importlib.import_module(module_name)
             return getattr(module, '__version__', 'Unknown')
         except (ImportError, AttributeError):
             return 'Unknown'
 
+@functools.lru_cache(maxsize=None)
+def _parse_script(path, mtime_ns):
+    """
+    Parse a script, cached by path and modification time.
+    
+    Args:
+        path (str): Absolute path to the script
+        mtime_ns (int): Modification time of the script, part of the cache key
+    
+    Returns:
+        ast.Module: Parsed tree of the script
+    """
+    with open(path, 'rb') as file:
+        return ast.parse(file.read(), filename=path)
+
+@functools.lru_cache(maxsize=None)
+def _imported_modules(path, mtime_ns):
+    """
+    Top-level names of every module imported by a script, cached like _parse_script.
+    
+    Args:
+        path (str): Absolute path to the script
+        mtime_ns (int): Modification time of the script, part of the cache key
+    
+    Returns:
+        frozenset: Imported top-level module names
+    """
+    module_names = set()
+    for node in ast.walk(_parse_script(path, mtime_ns)):
+        if isinstance(node, ast.Import):
+            module_names.update(alias.name.split('.')[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.module:
+                module_names.add(node.module.split('.')[0])
+    return frozenset(module_names)
+
+# Per-script result of the categorization, shared by every script importing it
+ModuleReport = namedtuple('ModuleReport', ['built_in', 'third_party', 'local', 'problematic'])
+_EMPTY_REPORT = ModuleReport(frozenset(), frozenset(), frozenset(), frozenset())
+
+# (path, mtime_ns) -> (ModuleReport, local module paths) of the script's own
+# imports only, so an entry never goes stale when a dependency changes
+_report_cache = {}
+_in_flight = {}  # (path, mtime_ns) -> Future of a categorization still running
+_report_lock = threading.Lock()  # Guards _report_cache and _in_flight
+
+# Local modules found on the same level of the import graph are analyzed
+# concurrently by one shared pool, the work is dominated by file reads and
+# import-system lookups
+MAX_WORKERS = 8
+
 def detect_modules(script_path, visited_scripts=None):
     """
     Recursively detect and categorize Python modules used in a script and its local imports.
     
     Args:
         script_path (str): Path to the Python script to analyze
-        visited_scripts (set, optional): Set of already processed script paths to prevent circular imports
+        visited_scripts (set, optional): Ignored, circular imports are handled
+            internally; kept for callers of the earlier signature
     
     Returns:
         dict: Categorized modules with versions
     """
-    # Initialize visited scripts set to track processed files
-    if visited_scripts is None:
-        visited_scripts = set()
+    report = _detect(os.path.abspath(script_path))
+    return {
+        'built_in': set(report.built_in),
+        'third_party': dict(report.third_party),
+        'local': set(report.local),
+        'problematic': set(report.problematic),
+    }
+
+def _detect(script_path):
+    """
+    Merge the reports of a script and of every local module it reaches.
     
-    # Prevent processing the same script multiple times
-    script_path = os.path.abspath(script_path)
-    if script_path in visited_scripts:
-        return {'built_in': [], 'third_party': [], 'local': []}
-    visited_scripts.add(script_path)
+    Only each script's own imports are cached; the merge over the import
+    graph runs on every call, so edited dependencies and circular imports
+    are always reflected.
     
+    Args:
+        script_path (str): Absolute path to the Python script to analyze
+    
+    Returns:
+        ModuleReport: Categorized modules, third-party ones as (module, version) pairs
+    """
+    report, local_paths = _script_report(script_path)
+    built_in = set(report.built_in)
+    third_party = dict(report.third_party)
+    local = set(report.local)
+    
+    # Walk the import graph level by level, each script once, with one pool
+    # of at most MAX_WORKERS threads for the whole walk
+    visited = {script_path}
+    frontier = [path for path in dict.fromkeys(local_paths) if path not in visited]
+    executor = None
+    try:
+        while frontier:
+            visited.update(frontier)
+            if len(frontier) > 1:
+                if executor is None:
+                    executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+                results = list(executor.map(_script_report, frontier))
+            else:
+                results = [_script_report(frontier[0])]
+            next_paths = {}
+            for local_report, paths in results:
+                built_in.update(local_report.built_in)
+                third_party.update(local_report.third_party)
+                local.update(local_report.local)
+                next_paths.update(dict.fromkeys(path for path in paths if path not in visited))
+            frontier = list(next_paths)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    
+    # Problems are only reported for the script itself, as before
+    return ModuleReport(frozenset(built_in), frozenset(third_party.items()),
+                        frozenset(local), report.problematic)
+
+def _script_report(script_path):
+    """
+    Categorize a script's own imports, reusing the cached result of an unchanged script.
+    
+    Args:
+        script_path (str): Absolute path to the Python script to analyze
+    
+    Returns:
+        tuple: ModuleReport of the script's imports and the paths of its local modules
+    """
+    try:
+        mtime_ns = os.stat(script_path).st_mtime_ns
+    except OSError as e:
+        print(f"Error reading script {script_path}: {e}")
+        return _EMPTY_REPORT, ()
+    
+    key = (script_path, mtime_ns)
+    with _report_lock:
+        result = _report_cache.get(key)
+        if result is not None:
+            return result
+        # Another thread already analyzing this script does it for everyone
+        pending = _in_flight.get(key)
+        if pending is None:
+            pending = _in_flight[key] = Future()
+            owner = True
+        else:
+            owner = False
+    if not owner:
+        return pending.result()
+    
+    try:
+        result = _categorize_script(script_path, mtime_ns)
+    except BaseException as e:
+        with _report_lock:
+            del _in_flight[key]
+        pending.set_exception(e)
+        raise
+    with _report_lock:
+        _report_cache[key] = result
+        del _in_flight[key]
+    pending.set_result(result)
+    return result
+
+def _categorize_script(script_path, mtime_ns):
+    """
+    Categorize the modules imported by a single script, without following local modules.
+    
+    Args:
+        script_path (str): Absolute path to the Python script to analyze
+        mtime_ns (int): Modification time of the script
+    
+    Returns:
+        tuple: ModuleReport of the script's imports, third-party ones as
+        (module, version) pairs, and the paths of its local modules
+    """
     # Categorized modules dictionary
     categorized_modules = {
         'built_in': set(),
@@ -57,30 +238,26 @@ def detect_modules(script_path, visited_scripts=None):
     # Get the directory of the script
     script_dir = os.path.dirname(script_path)
     
-    # Read the script
+    # Read and parse the script's AST to find imports, reusing earlier parses
     try:
-        with open(script_path, 'r') as file:
-            script_content = file.read()
+        module_names = _imported_modules(script_path, mtime_ns)
+    except SyntaxError:
+        print(f"Syntax error parsing script: {script_path}")
+        return _EMPTY_REPORT, ()
     except Exception as e:
         print(f"Error reading script {script_path}: {e}")
-        return categorized_modules
+        return _EMPTY_REPORT, ()
     
-    # Parse the script's AST to find imports
-    module_names = set()
-    try:
-        tree = ast.parse(script_content)
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                module_names.update(alias.name.split('.')[0] for alias in node.names)
-            elif isinstance(node, ast.ImportFrom):
-                if node.module:
-                    module_names.add(node.module.split('.')[0])
-    except SyntaxError:
-        print(f"Syntax error parsing script: {script_path}")
-        return categorized_modules
+    # Local modules for the caller to follow
+    local_paths = []
     
     # Categorize modules
     for module in module_names:
+        # Standard library and compiled-in modules are known without touching disk
+        if module in sys.builtin_module_names or module in sys.stdlib_module_names:
+            categorized_modules['built_in'].add(module)
+            continue
+        
         # Check built-in modules
         try:
             spec = importlib.util.find_spec(module)
@@ -107,21 +284,7 @@ def detect_modules(script_path, visited_scripts=None):
                 if os.path.exists(local_module_path):
                     # Local module found
                     categorized_modules['local'].add(module)
-                    
-                    # Recursively detect modules in the local module
-                    local_module_modules = detect_modules(
-                        local_module_path, 
-                        visited_scripts
-                    )
-                    
-                    # Merge detected modules
-                    for category, mods in local_module_modules.items():
-                        if category == 'third_party':
-                            categorized_modules[category].update(mods)
-                        elif category == 'local':
-                            categorized_modules[category].update(mods)
-                        elif category == 'built_in':
-                            categorized_modules[category].update(mods)
+                    local_paths.append(os.path.abspath(local_module_path))
                 else:
                     # Local module not found
                     raise Exception(f"Local module {module} not found in {script_dir}")
@@ -130,7 +293,12 @@ def detect_modules(script_path, visited_scripts=None):
             categorized_modules['problematic'].add(module)
             # print(f"Error processing module {module}: {e}")
     
-    return categorized_modules
+    return ModuleReport(
+        frozenset(categorized_modules['built_in']),
+        frozenset(categorized_modules['third_party'].items()),
+        frozenset(categorized_modules['local']),
+        frozenset(categorized_modules['problematic']),
+    ), tuple(local_paths)
 
 def print_module_report(modules):
     """
@@ -1,7 +1,102 @@
-import inspect
 import dis
+import opcode
+import types
+import weakref
 import builtins
 
+# Values a pure function may read from globals or closures; functions are
+# allowed because they get checked recursively
+_IMMUTABLE = (int, float, str, tuple, frozenset, bytes, type(None))
+_ALLOWED_VALUES = _IMMUTABLE + (types.FunctionType,)
+
+# Verdicts of finished analyses, keyed by the function object itself since
+# purity also depends on its closure cells and globals, not only its code.
+# Each verdict is stored with a fingerprint of every function it was based
+# on, and is dropped once one of them changes code, cells or globals read.
+_PURITY_CACHE = weakref.WeakKeyDictionary()
+
+# Global names read by each code object, in a fixed order for fingerprints
+_GLOBAL_NAMES = weakref.WeakKeyDictionary()
+
+_MISSING = object()  # Stands in for unbound globals and empty cells
+
+# Opcode ids scanned directly in the raw bytecode
+_IMPURE_OPS = frozenset({
+    opcode.opmap['STORE_DEREF'],   # Modifying closure variable
+    opcode.opmap['STORE_GLOBAL'],  # Modifying global variable
+})
+_LOAD_GLOBAL = opcode.opmap['LOAD_GLOBAL']
+# Every call opcode of the running interpreter (names differ across versions)
+_CALL_OPS = frozenset(opcode.opmap[name] for name in (
+    'CALL', 'CALL_FUNCTION', 'CALL_FUNCTION_KW', 'CALL_FUNCTION_EX', 'CALL_METHOD',
+) if name in opcode.opmap)
+
+def _global_names(code):
+    """
+    Collect the names a code object, and the code nested in it, loads as globals.
+    
+    Args:
+        code (types.CodeType): Code object to scan
+    
+    Returns:
+        set: Global names read by the code
+    """
+    names = set()
+    # Only decode instructions when the raw bytes contain a LOAD_GLOBAL
+    if _LOAD_GLOBAL in set(code.co_code[::2]):
+        names.update(instr.argval for instr in dis.get_instructions(code)
+                     if instr.opcode == _LOAD_GLOBAL)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _global_names(const)
+    return names
+
+def _fingerprint(func):
+    """
+    Identify the state a purity verdict for func was based on: its code, and
+    the identity and type of every global it reads and every closure cell.
+    
+    Args:
+        func (types.FunctionType): Analyzed function
+    
+    Returns:
+        tuple: Fingerprint, equal for as long as that state is unchanged
+    """
+    code = func.__code__
+    names = _GLOBAL_NAMES.get(code)
+    if names is None:
+        names = _GLOBAL_NAMES[code] = tuple(sorted(_global_names(code)))
+    func_globals = func.__globals__
+    values = [func_globals.get(name, _MISSING) for name in names]
+    for cell in func.__closure__ or ():
+        try:
+            values.append(cell.cell_contents)
+        except ValueError:
+            values.append(_MISSING)  # Empty cell
+    return id(code), tuple((id(value), type(value)) for value in values)
+
+def _verdict_entry(funcs, pure):
+    # Every verdict depends on all functions visited to reach it
+    deps = tuple((weakref.ref(f), _fingerprint(f)) for f in funcs)
+    return pure, deps
+
+def _cached_verdict(func, _analyzed_funcs):
+    entry = _PURITY_CACHE.get(func)
+    if entry is None:
+        return None
+    pure, deps = entry
+    funcs = []
+    for ref, fingerprint in deps:
+        dep = ref()
+        if dep is None or _fingerprint(dep) != fingerprint:
+            del _PURITY_CACHE[func]
+            return None
+        funcs.append(dep)
+    if _analyzed_funcs is not None:
+        # The caller's verdict now rests on the same functions
+        _analyzed_funcs.update(funcs)
+    return pure
+
 def is_pure_function(func, _analyzed_funcs=None):
     """
     Check if a function is pure by analyzing bytecode, closure variables, and recursively checking function calls.
@@ -13,8 +108,14 @@ def is_pure_function(func, _analyzed_funcs=None):
     Returns:
         bool: True if function appears to be pure, False otherwise
     """
+    # Reuse the verdict of an earlier analysis
+    cached = _cached_verdict(func, _analyzed_funcs)
+    if cached is not None:
+        return cached
+    
     # Initialize set of analyzed functions to prevent infinite recursion
-    if _analyzed_funcs is None:
+    top_level = _analyzed_funcs is None
+    if top_level:
         _analyzed_funcs = set()
     
     # Prevent analyzing the same function multiple times
@@ -22,46 +123,82 @@ def is_pure_function(func, _analyzed_funcs=None):
         return True
     _analyzed_funcs.add(func)
     
-    # Check closure variables
-    closure_vars = inspect.getclosurevars(func)
+    pure = _analyze_purity(func, _analyzed_funcs)
+    if not pure:
+        # A violation found anywhere is final
+        _PURITY_CACHE[func] = _verdict_entry(_analyzed_funcs, False)
+    elif top_level:
+        # Every function visited by a successful analysis is pure as well; inner
+        # results are only final here, once functions assumed pure in a cycle are settled
+        entry = _verdict_entry(_analyzed_funcs, True)
+        for analyzed in _analyzed_funcs:
+            _PURITY_CACHE[analyzed] = entry
+    return pure
+
+def _analyze_purity(func, _analyzed_funcs):
+    """
+    Run the actual purity checks for is_pure_function, without caching.
+    
+    Args:
+        func (callable): Function to check for purity
+        _analyzed_funcs (set): Functions already being analyzed
     
-    # Check if any non-read-only closure variables exist
-    for var, value in closure_vars.nonlocals.items():
-        if not isinstance(value, (int, float, str, tuple, frozenset, bytes, type(None))):
+    Returns:
+        bool: True if function appears to be pure, False otherwise
+    """
+    code = func.__code__
+    
+    # Analyze bytecode: wordcode puts an opcode at every even offset, so the
+    # set of opcodes used comes straight from the raw bytes
+    ops = set(code.co_code[::2])
+    
+    # Check for impure operations
+    if not ops.isdisjoint(_IMPURE_OPS):
+        return False
+    
+    # Check if any non-read-only closure variables exist, read straight from
+    # the cells instead of going through inspect.getclosurevars
+    # (functions are allowed here, they are checked recursively below)
+    for var, cell in zip(code.co_freevars, func.__closure__ or ()):
+        try:
+            value = cell.cell_contents
+        except ValueError:
+            continue  # Empty cell
+        if not isinstance(value, _ALLOWED_VALUES):
             return False
     
-    for var, value in closure_vars.globals.items():
-        # Allow only immutable globals and builtins
-        if not (isinstance(value, (int, float, str, tuple, frozenset, bytes, type(None))) or 
+    func_globals = func.__globals__
+    for var in _global_names(code):
+        if var not in func_globals:
+            continue  # Builtin or undefined name
+        value = func_globals[var]
+        # Allow only immutable globals, functions and builtins
+        if not (isinstance(value, _ALLOWED_VALUES) or 
                 hasattr(builtins, var)):
             return False
     
-    # Analyze bytecode
-    code = dis.Bytecode(func)
-    
     # Tracks function calls to recursively check
     function_calls = []
     
-    impure_ops = {
-        'STORE_DEREF',   # Modifying closure variable
-        'STORE_GLOBAL',  # Modifying global variable
-    }
-    
-    for instr in code:
-        # Track function calls for recursive purity check
-        if instr.opname == 'CALL_FUNCTION':
-            # Try to get the function being called
-            try:
-                # This is a simplified approach and might not work for all cases
-                frame = inspect.currentframe()
-                function_calls.append(frame.f_locals.get(instr.argval))
-            except Exception:
-                # If we can't determine the function, assume it might not be pure
-                return False
-        
-        # Check for impure operations
-        if instr.opname in impure_ops:
-            return False
+    # Only decode instructions when there is a call to look at
+    if not ops.isdisjoint(_CALL_OPS):
+        freevars = code.co_freevars
+        closure = func.__closure__ or ()
+        for instr in dis.get_instructions(func):
+            # Resolve functions statically from the names the code loads
+            if instr.opname == 'LOAD_GLOBAL':
+                value = func_globals.get(instr.argval)
+            elif instr.opname == 'LOAD_DEREF' and instr.argval in freevars:
+                try:
+                    value = closure[freevars.index(instr.argval)].cell_contents
+                except ValueError:
+                    # Empty cell, nothing to follow
+                    continue
+            else:
+                continue
+            # Track function calls for recursive purity check
+            if isinstance(value, types.FunctionType):
+                function_calls.append(value)
     
     # Recursively check purity of called functions
     for called_func in function_calls:
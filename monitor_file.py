@@ -1,9 +1,20 @@
 import time
+import threading
+import collections
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler, PatternMatchingEventHandler
 import logging
-from datetime import datetime
 import os
+import sys
+import glob
+import re
+import fnmatch
+
+# io_uring is optional and Linux only, the buffered file is the fallback
+try:
+    import liburing
+except ImportError:
+    liburing = None
 
 # Set up logging
 logging.basicConfig(
@@ -12,14 +23,100 @@ logging.basicConfig(
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 
+# Writer batching: flush after this many events or this many seconds
+MAX_BATCH = 256
+FLUSH_INTERVAL = 0.1
+URING_DEPTH = 256
+NUM_WORKERS = min(4, os.cpu_count() or 1)
+
+# Repeats of the same event on the same path within this window are dropped
+DEBOUNCE_NS = 200_000_000
+
+# Log labels for the event types handled in on_any_event (moves are separate)
+EVENT_LABELS = {
+    "created": "File created",
+    "modified": "File modified",
+    "deleted": "File deleted",
+}
+
+class IoUringLogSink:
+    """
+    Append-only log sink that submits writes through io_uring.
+
+    Each batch from a writer thread becomes a single SQE, so the lines keep
+    their order without having to link requests. write_lines submits it and
+    waits for its completion, so there is never more than one write in
+    flight: the gain is one submission per batch, not asynchronous I/O.
+    """
+    def __init__(self, path, depth=URING_DEPTH):
+        self._ring = liburing.io_uring()
+        self._cqe = liburing.io_uring_cqe()
+        liburing.io_uring_queue_init(depth, self._ring, 0)
+        try:
+            self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | os.O_CLOEXEC, 0o644)
+        except BaseException:
+            liburing.io_uring_queue_exit(self._ring)
+            raise
+
+    def write_lines(self, lines):
+        buf = b"".join(lines)
+        while buf:
+            sqe = liburing.io_uring_get_sqe(self._ring)
+            liburing.io_uring_prep_write(sqe, self._fd, buf, len(buf), -1)
+            liburing.io_uring_submit(self._ring)
+            liburing.io_uring_wait_cqe(self._ring, self._cqe)
+            res = self._cqe.res
+            liburing.io_uring_cqe_seen(self._ring, self._cqe)
+            if res < 0:
+                raise OSError(-res, os.strerror(-res))
+            buf = buf[res:]  # Resubmit the rest after a short write
+
+    def close(self):
+        liburing.io_uring_queue_exit(self._ring)
+        os.close(self._fd)
+
+class VectoredLogSink:
+    """
+    Append-only log sink that hands a whole batch of lines to the kernel
+    in one os.writev call, without joining them first.
+    """
+    def __init__(self, path):
+        self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_CLOEXEC', 0), 0o644)
+
+    def write_lines(self, lines):
+        if hasattr(os, 'writev'):
+            written = os.writev(self._fd, lines)
+            total = sum(map(len, lines))
+            if written == total:
+                return
+            rest = b"".join(lines)[written:]  # Short write, finish it below
+        else:
+            rest = b"".join(lines)
+        while rest:
+            rest = rest[os.write(self._fd, rest):]
+
+    def close(self):
+        os.close(self._fd)
+
+def open_log_sink(path):
+    if liburing is not None and sys.platform.startswith('linux'):
+        try:
+            return IoUringLogSink(path)
+        except OSError:
+            pass  # Kernel without io_uring support
+    return VectoredLogSink(path)
+
 class FilteredFileHandler(PatternMatchingEventHandler):
     def __init__(self, log_file, ignore_patterns=None):
         # Convert log_file to absolute path for reliable pattern matching
         self.log_file = os.path.abspath(log_file)
+        self._log_basename = os.path.basename(self.log_file)
         
-        # Create ignore patterns list, always including the log file
-        print(f"*{os.path.basename(self.log_file)}")
-        ignore_patterns_in = [f"*{os.path.basename(self.log_file)}"]
+        # Create ignore patterns list, always including the log file by its
+        # exact absolute path and by name, so watchdog drops its events
+        # before they are dispatched
+        logging.debug(f"Ignoring log file pattern *{self._log_basename}")
+        ignore_patterns_in = [glob.escape(self.log_file), f"*{glob.escape(self._log_basename)}"]
         if ignore_patterns:
             ignore_patterns_in.extend(ignore_patterns)
             
@@ -29,34 +126,103 @@ class FilteredFileHandler(PatternMatchingEventHandler):
             ignore_directories=True,
             case_sensitive=False
         )
+        # All ignore patterns as one regex, so each path is matched once.
+        # Relative patterns may match any trailing part of the path
+        self._ignore_re = re.compile(
+            "|".join(("" if p.startswith(("/", "*")) else "(?:.*/)?") + fnmatch.translate(p)
+                     for p in ignore_patterns_in),
+            re.IGNORECASE
+        ).match
+
+        # Events are appended to a ring by the observer thread and written
+        # in batches by worker threads, each with its own append-only sink
+        self._ring = collections.deque()
+        self._stop = threading.Event()
+        self._workers = []
+
+        # Last time each (path, event_type) was logged, for debouncing
+        self._last = {}
+        self._debounce_ns = DEBOUNCE_NS
+        self._next_sweep = 0
+
+    def start_writer(self, num_workers=NUM_WORKERS):
+        for _ in range(num_workers):
+            worker = threading.Thread(target=self._drain, daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def stop_writer(self):
+        # Workers write out what is left in the ring before exiting
+        self._stop.set()
+        for worker in self._workers:
+            worker.join()
+
+    def _drain(self, max_batch=MAX_BATCH, interval=FLUSH_INTERVAL):
+        # Appends on an O_APPEND file are atomic, so workers need no lock,
+        # but lines from different workers may land slightly out of order
+        sink = open_log_sink(self.log_file)
+        popleft = self._ring.popleft
+        try:
+            while True:
+                batch = []
+                try:
+                    while len(batch) < max_batch:
+                        batch.append(popleft())
+                except IndexError:
+                    pass
+                if batch:
+                    sink.write_lines([
+                        f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ts))} - {event_type}: {path}\n".encode()
+                        for event_type, path, ts in batch])
+                    for event_type, path, _ in batch:
+                        logging.info(f"{event_type}: {path}")
+                elif self._stop.is_set():
+                    return
+                else:
+                    self._stop.wait(interval)  # Back off while the ring is empty
+        finally:
+            sink.close()
 
     def log_event(self, event_type, path):
-        # Convert to absolute path for consistent logging
-        abs_path = os.path.abspath(path)
-        
-        # Double-check that we're not logging the log file itself
-        if abs_path != self.log_file:
-            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            with open(self.log_file, 'a') as f:
-                f.write(f"{timestamp} - {event_type}: {path}\n")
-            logging.info(f"{event_type}: {path}")
-
-    def on_created(self, event):
-        if not event.is_directory:
-            self.log_event("File created", event.src_path)
-
-    def on_modified(self, event):
-        if not event.is_directory:
-            self.log_event("File modified", event.src_path)
-
-    def on_deleted(self, event):
-        if not event.is_directory:
-            self.log_event("File deleted", event.src_path)
-
-    def on_moved(self, event):
-        if not event.is_directory:
+        # Coalesce editor save storms into a single event per debounce window
+        now = time.monotonic_ns()
+        key = (path, event_type)
+        last = self._last
+        if now - last.get(key, -self._debounce_ns) < self._debounce_ns:
+            return
+        last[key] = now
+        if now >= self._next_sweep:
+            # Forget entries far older than the window so the dict stays small
+            horizon = now - 10 * self._debounce_ns
+            self._last = {k: t for k, t in last.items() if t >= horizon}
+            self._next_sweep = now + 10 * self._debounce_ns
+
+        # The log file itself is already filtered out by ignore_patterns
+        self._ring.append((event_type, path, time.time()))
+
+    def dispatch(self, event):
+        # Replaces the parent's per-pattern filtering with the combined regex
+        if self.ignore_directories and event.is_directory:
+            return
+        ignored = self._ignore_re
+        if ignored(os.fsdecode(event.src_path)) is not None:
+            return
+        dest_path = getattr(event, "dest_path", "")
+        if dest_path and ignored(os.fsdecode(dest_path)) is not None:
+            return
+        FileSystemEventHandler.dispatch(self, event)
+
+    def on_any_event(self, event):
+        if event.is_directory:
+            return
+        event_type = event.event_type
+        if event_type == "moved":
             self.log_event("File moved/renamed", 
                           f"from {event.src_path} to {event.dest_path}")
+        else:
+            label = EVENT_LABELS.get(event_type)
+            if label is not None:
+                self.log_event(label, event.src_path)
 
 def start_monitoring(path_to_watch, log_file="file_changes.log", ignore_patterns=None):
     """
@@ -75,7 +241,8 @@ def start_monitoring(path_to_watch, log_file="file_changes.log", ignore_patterns
         # Schedule the observer
         observer.schedule(event_handler, path_to_watch, recursive=False)
         
-        # Start the observer
+        # Start the log writer and the observer
+        event_handler.start_writer()
         observer.start()
         logging.info(f"Started monitoring {path_to_watch}")
         logging.info(f"Logging changes to {log_file}")
@@ -89,6 +256,8 @@ def start_monitoring(path_to_watch, log_file="file_changes.log", ignore_patterns
             logging.info("Monitoring stopped by user")
         
         observer.join()
+        # Write out any queued events before exiting
+        event_handler.stop_writer()
         
     except Exception as e:
         logging.error(f"Error occurred: {str(e)}")
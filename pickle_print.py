@@ -1,23 +1,112 @@
 #!/usr/bin/env python3
 
 import sys
+import os
 import pickle
-import pprint
+import pickletools
+import importlib
+import _compat_pickle
 
 from inspect_instance import inspect_object, A
 from inspect_inheritance import get_class_details
 
+# Pickles larger than this are scanned for classes instead of loaded
+STREAM_THRESHOLD = 512 << 20
+
+_STRING_OPS = frozenset(('SHORT_BINUNICODE', 'BINUNICODE', 'BINUNICODE8', 'UNICODE',
+                         'SHORT_BINSTRING', 'BINSTRING', 'STRING'))
+_PUT_OPS = frozenset(('PUT', 'BINPUT', 'LONG_BINPUT'))
+_GET_OPS = frozenset(('GET', 'BINGET', 'LONG_BINGET'))
+
+def pickled_globals(f):
+    """
+    Stream the opcodes of a pickle and yield the (module, name) of every
+    global it references, in order of first use, without building any objects.
+    """
+    seen = set()
+    memo = {}
+    memo_size = 0
+    strings = []  # Recently pushed string values, enough for STACK_GLOBAL
+    for op, arg, _ in pickletools.genops(f):
+        name = op.name
+        if name in _STRING_OPS:
+            strings.append(arg)
+            del strings[:-2]
+            continue
+        if name == 'MEMOIZE' or name in _PUT_OPS:
+            # Only strings are remembered, the other memo entries are never needed
+            if name == 'MEMOIZE':
+                index, memo_size = memo_size, memo_size + 1
+            else:
+                index = arg
+            if strings:
+                memo[index] = strings[-1]
+            else:
+                memo.pop(index, None)
+            continue
+        if name in _GET_OPS:
+            value = memo.get(arg)
+            if value is not None:
+                strings.append(value)
+                del strings[:-2]
+            continue
+        if name == 'GLOBAL':
+            ref = tuple(arg.split(' ', 1))
+        elif name == 'STACK_GLOBAL' and len(strings) == 2:
+            ref = tuple(strings)
+        else:
+            if name != 'FRAME':
+                strings.clear()
+            continue
+        strings.clear()
+        if ref not in seen:
+            seen.add(ref)
+            yield ref
+
+def _resolve(module, qualname):
+    # Python 2 names, as written by protocols 0-2, mapped the way Unpickler does
+    if (module, qualname) in _compat_pickle.NAME_MAPPING:
+        module, qualname = _compat_pickle.NAME_MAPPING[(module, qualname)]
+    elif module in _compat_pickle.IMPORT_MAPPING:
+        module = _compat_pickle.IMPORT_MAPPING[module]
+    obj = sys.modules.get(module) or importlib.import_module(module)
+    for part in qualname.split('.'):
+        obj = getattr(obj, part)
+    return obj
+
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python inspect_pickle.py <pickle_file>")
+    args = sys.argv[1:]
+    stream = '--classes' in args
+    if stream:
+        args.remove('--classes')
+    if len(args) != 1:
+        print("Usage: python inspect_pickle.py [--classes] <pickle_file>")
         sys.exit(1)
 
-    pickle_file = sys.argv[1]
+    pickle_file = args[0]
 
     try:
-        with open(pickle_file, 'rb') as f:
-            data = pickle.load(f)
-        # pprint.pprint(data)
+        if not stream and os.path.getsize(pickle_file) > STREAM_THRESHOLD:
+            print(f"{pickle_file} is larger than {STREAM_THRESHOLD >> 20} MiB, "
+                  "showing class details only (pass --classes to skip this check)")
+            stream = True
+        if stream:
+            # Only class details, the object graph is never materialized
+            with open(pickle_file, 'rb', buffering=1 << 20) as f:
+                for module, qualname in pickled_globals(f):
+                    try:
+                        cls = _resolve(module, qualname)
+                    except (ImportError, AttributeError) as e:
+                        print(f"Skipping {module}.{qualname}: {e}")
+                        continue
+                    if isinstance(cls, type) and cls.__module__ not in ('builtins', 'copyreg', '_codecs'):
+                        get_class_details(cls)
+            return
+
+        # 1 MiB read buffer
+        with open(pickle_file, 'rb', buffering=1 << 20) as f:
+            data = pickle.Unpickler(f).load()
+        # import pprint; pprint.pprint(data)
         
         get_class_details(data.__class__)
         inspect_object(data)
@@ -29,3 +118,4 @@ if __name__ == '__main__':
     main()
 
 # python pickle_print.py your_pickle_file.pkl
+# python pickle_print.py --classes your_huge_pickle_file.pkl
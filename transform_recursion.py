@@ -1,13 +1,35 @@
 import ast
+import dis
 import inspect
+import logging
+import os
+import sys
 import textwrap
 import types
+import warnings
+import weakref
+
+log = logging.getLogger(__name__)
+
+# Transformed code objects, alive as long as a function using them is
+_TRANSFORM_CACHE = weakref.WeakValueDictionary()
+
+def _body_without_docstring(func_node):
+    # Only an actual docstring may precede the pattern, any other statement rules it out
+    body = func_node.body
+    if (body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant)
+            and isinstance(body[0].value.value, str)):
+        return body[1:]
+    return body
+
+def _names_read(node):
+    return {n.id for n in ast.walk(node) if isinstance(n, ast.Name) and isinstance(n.ctx, ast.Load)}
 
 class TailRecursionTransformer(ast.NodeTransformer):
     """
     This AST transformer can handle *either* a top-level 'if' statement
-    OR a top-level 'match' statement with a single fallback case that
-    does the tail call.
+    OR a top-level 'match' statement with one or more cases that
+    do the tail call.
     
     Pattern handled:
     
@@ -26,12 +48,21 @@ class TailRecursionTransformer(ast.NodeTransformer):
     def func(...):
         if <condition>:
             return <base_expr>
-        return func(<updated_args>)
+        return func(<updated_args>)  # or: else: return func(<updated_args>)
     """
     
     def __init__(self, func_name):
         super().__init__()
         self.func_name = func_name
+        self._temp_counter = 0  # Numbers the temporaries of the targeted function
+        self.transformed = False  # Set once the targeted function has been rewritten
+
+    def visit(self, node):
+        # Only top-level functions can be targets, so skip the generic walk
+        if isinstance(node, ast.Module):
+            node.body = [self.visit_FunctionDef(n) if isinstance(n, ast.FunctionDef) else n
+                         for n in node.body]
+        return node
 
     def visit_FunctionDef(self, node):
         if node.name != self.func_name:
@@ -52,11 +83,13 @@ class TailRecursionTransformer(ast.NodeTransformer):
         new_body = self._maybe_transform_if_tail_recursion(node)
         if new_body is not None:
             node.body = new_body
+            self.transformed = True
             return node
         
         new_body = self._maybe_transform_match_tail_recursion(node)
         if new_body is not None:
             node.body = new_body
+            self.transformed = True
             return node
         
         return node  # no transformation
@@ -69,53 +102,78 @@ class TailRecursionTransformer(ast.NodeTransformer):
                 return <base_expr>
             return func(<updated_args>)
             
-        into:
+        (or the same with the tail call in an else branch, see
+        _split_if_tail_recursion) into:
         
-            while True:
-                if <condition>:
-                    return <base_expr>
+            while not <condition>:
                 # reassign ...
-        """
-        if len(node.body) != 3:
-            return None
-        
-        if_stmt = node.body[1]
-        return_stmt = node.body[2]
-        
-        if not (isinstance(if_stmt, ast.If) and isinstance(return_stmt, ast.Return)):
-            return None
+            return <base_expr>
         
-        # Check if the if-statement has exactly one return statement in its body
-        if len(if_stmt.body) != 1 or not isinstance(if_stmt.body[0], ast.Return):
-            return None
-        if if_stmt.orelse:
-            # We only handle if with no else
+        so each iteration takes a single branch and the loop exit falls through.
+        """
+        parts = self._split_if_tail_recursion(node)
+        if parts is None:
             return None
+        test, base_return, call_node = parts
         
-        # Check if the second statement is a tail call to the same function
-        if not isinstance(return_stmt.value, ast.Call):
-            return None
-        call_node = return_stmt.value
-        if not (isinstance(call_node.func, ast.Name) and call_node.func.id == self.func_name):
+        # If we've gotten here, we have the pattern we're looking for.
+        assignments = self._make_assignment_from_call(node, call_node)
+        if assignments is None:
             return None
         
-        # If we've gotten here, we have the pattern we're looking for.
-        condition_check = ast.If(
-            test=if_stmt.test,
-            body=[if_stmt.body[0]],
+        while_node = ast.While(
+            test=ast.UnaryOp(op=ast.Not(), operand=test),
+            body=assignments,
             orelse=[]
         )
+        return [while_node, base_return]
+
+    def _is_self_tail_call(self, stmt):
+        return (isinstance(stmt, ast.Return) and isinstance(stmt.value, ast.Call)
+                and isinstance(stmt.value.func, ast.Name) and stmt.value.func.id == self.func_name)
+
+    def _split_if_tail_recursion(self, node):
+        """
+        Normalize the supported if-shapes, after an optional docstring, to
+        (condition, base_return, tail_call), where the loop runs while the
+        condition is false:
         
-        assignment = self._make_assignment_from_call(node, call_node)
-        if assignment is None:
+            if <condition>:                 if <condition>:
+                return <base_expr>              return <base_expr>
+            return func(<updated_args>)     else:
+                                                return func(<updated_args>)
+        
+        The swapped if/else, with the tail call in the body and the base case in
+        the else branch, is returned with the condition negated.
+        """
+        stmts = _body_without_docstring(node)
+        if len(stmts) == 2:
+            if_stmt, return_stmt = stmts
+            if not (isinstance(if_stmt, ast.If) and not if_stmt.orelse):
+                return None
+            branch = if_stmt.body
+        elif len(stmts) == 1:
+            if_stmt = stmts[0]
+            if not (isinstance(if_stmt, ast.If) and len(if_stmt.orelse) == 1):
+                return None
+            branch, return_stmt = if_stmt.body, if_stmt.orelse[0]
+        else:
             return None
         
-        while_node = ast.While(
-            test=ast.Constant(value=True),
-            body=[condition_check, assignment],
-            orelse=[]
-        )
-        return [while_node]
+        # Each branch must be a single return
+        if len(branch) != 1 or not isinstance(branch[0], ast.Return) or not isinstance(return_stmt, ast.Return):
+            return None
+        base_return = branch[0]
+        test = if_stmt.test
+        if self._is_self_tail_call(base_return) and len(stmts) == 1:
+            # if <condition>: return func(...) else: return <base_expr>
+            base_return, return_stmt = return_stmt, base_return
+            test = ast.UnaryOp(op=ast.Not(), operand=test)
+        
+        # The remaining return must be the tail call to the same function
+        if not self._is_self_tail_call(return_stmt):
+            return None
+        return test, base_return, return_stmt.value
 
     def _maybe_transform_match_tail_recursion(self, node):
         """
@@ -141,83 +199,195 @@ class TailRecursionTransformer(ast.NodeTransformer):
                     ...
                     case _:
                         # reassign ...
+                        continue
+                return None
+        
+        Several cases may do a tail call, each becomes a reassignment + continue.
         """
-        if len(node.body) != 2:
+        stmts = _body_without_docstring(node)
+        if len(stmts) != 1:
             return None
         
-        match_stmt = node.body[1]
+        match_stmt = stmts[0]
         if not isinstance(match_stmt, ast.Match):
             return None
         
-        # We expect exactly one case whose body is a tail call, and one or more that are base-case returns
+        # We expect one or more cases whose body is a tail call, the others are base-case returns
         # We'll parse the match statement to see if it fits the pattern
-        tail_call_case_idx = -1
-        for idx, match_case in enumerate(match_stmt.cases):
+        tail_call_cases = []
+        for match_case in match_stmt.cases:
             if len(match_case.body) == 1 and isinstance(match_case.body[0], ast.Return):
                 ret = match_case.body[0].value
                 if isinstance(ret, ast.Call) and isinstance(ret.func, ast.Name) and ret.func.id == self.func_name:
-                    # found the tail call
-                    if tail_call_case_idx != -1:
-                        # multiple tail calls not supported
-                        return None
-                    tail_call_case_idx = idx
+                    # found a tail call
+                    tail_call_cases.append(match_case)
         
-        if tail_call_case_idx == -1:
+        if not tail_call_cases:
             # no tail call found
             return None
         
         # Construct a new 'while True:' containing a single match block.
-        # Inside that match block, all cases remain the same *except* the tail call case
-        # is replaced with an assignment statement (param re-bind).
+        # Inside that match block, all cases remain the same *except* the tail call cases,
+        # each replaced with an assignment statement (param re-bind) and a `continue`.
         
-        # We'll figure out the function's parameter names:
-        param_names = [arg.arg for arg in node.args.args]
+        # Each tail call case calls the function with updated arguments
+        case_assignments = []
+        for tail_call_case in tail_call_cases:
+            call_node = tail_call_case.body[0].value
+            assignments = self._make_assignment_from_call(node, call_node)
+            if assignments is None:
+                return None
+            case_assignments.append(assignments)
         
-        # The tail call case (match_stmt.cases[tail_call_case_idx]) calls the function with updated arguments
-        tail_call_case = match_stmt.cases[tail_call_case_idx]
-        return_stmt = tail_call_case.body[0]  # the Return node
-        call_node = return_stmt.value
-        assignment = self._make_assignment_from_call(node, call_node)
-        if assignment is None:
-            return None
-        
-        # Replace the tail call return with that assignment
-        tail_call_case.body = [assignment]
+        # Replace the tail call returns with those assignments
+        for tail_call_case, assignments in zip(tail_call_cases, case_assignments):
+            tail_call_case.body = assignments + [ast.Continue()]
         
-        # Wrap this entire match in `while True: match <expr>:` ...
+        # Wrap this entire match in `while True: match <expr>:` ... and keep the
+        # implicit `return None` when no case returns or loops
         while_node = ast.While(
             test=ast.Constant(value=True),
-            body=[match_stmt],
+            body=[match_stmt, ast.Return(value=None)],
             orelse=[]
         )
         return [while_node]
 
     def _make_assignment_from_call(self, funcdef_node, call_node):
         """
-        Build an ast.Assign that reassigns the function parameters from the call arguments.
+        Build the statements that reassign the function parameters from the call arguments.
         If the call has mismatch of param count, return None.
         
-        For example, if the tail call is:
-            return func_name(n-1, acc*n)
+        When no argument reads a parameter that is reassigned before it, the
+        parameters are simply assigned in order. For example, if the tail call is:
+            return func_name(n-1, 0)
+            
+        we build:
+            n = n - 1
+            acc = 0
             
-        we build an assignment:
-            n, acc = (n-1), (acc*n)
+        Otherwise (e.g. `return func_name(n-1, acc*n)`, where acc*n needs the old n)
+        every argument is first evaluated into a temporary:
+            _tail_arg0 = n - 1
+            _tail_arg1 = acc * n
+            n = _tail_arg0
+            acc = _tail_arg1
         """
         param_names = [arg.arg for arg in funcdef_node.args.args]
         if len(call_node.args) != len(param_names):
             return None
         
-        target_list = []
-        value_list = []
-        for pname, arg in zip(param_names, call_node.args):
-            target_list.append(ast.Name(id=pname, ctx=ast.Store()))
-            value_list.append(arg)
+        # A later argument reading an earlier, already reassigned parameter is aliasing
+        read_sets = [_names_read(arg) for arg in call_node.args]
+        aliased = any(param_names[j] in read_sets[k]
+                      for j in range(len(param_names))
+                      for k in range(j + 1, len(read_sets)))
+        if not aliased:
+            return [ast.Assign(targets=[ast.Name(id=pname, ctx=ast.Store())], value=arg)
+                    for pname, arg in zip(param_names, call_node.args)]
         
-        assignment = ast.Assign(
-            targets=[ast.Tuple(elts=target_list, ctx=ast.Store())],
-            value=ast.Tuple(elts=value_list, ctx=ast.Load())
-        )
-        return assignment
+        temps = []
+        for _ in call_node.args:
+            temps.append(f"_tail_arg{self._temp_counter}")
+            self._temp_counter += 1
+        return ([ast.Assign(targets=[ast.Name(id=temp, ctx=ast.Store())], value=arg)
+                 for temp, arg in zip(temps, call_node.args)]
+                + [ast.Assign(targets=[ast.Name(id=pname, ctx=ast.Store())],
+                              value=ast.Name(id=temp, ctx=ast.Load()))
+                   for pname, temp in zip(param_names, temps)])
+
+# In-place bytecode rewriting relies on the 3.11/3.12 instruction layout
+_BYTECODE_REWRITE = sys.version_info[:2] in ((3, 11), (3, 12))
+_NOP = dis.opmap['NOP']
+_STORE_FAST = dis.opmap['STORE_FAST']
+_JUMP_BACKWARD = dis.opmap.get('JUMP_BACKWARD')
+_JUMP_OPS = frozenset(dis.hasjrel + dis.hasjabs)
+_UNSUPPORTED_FLAGS = (inspect.CO_VARARGS | inspect.CO_VARKEYWORDS | inspect.CO_GENERATOR
+                      | inspect.CO_COROUTINE | inspect.CO_ASYNC_GENERATOR)
+
+def _rewrite_tail_calls_bytecode(func):
+    """
+    Rewrite `return func(<args>)` directly in func.__code__, without source.
+    
+    The sequence
+        LOAD_GLOBAL (NULL + func); <args>; [PRECALL n]; CALL n; RETURN_VALUE
+    becomes
+        NOP...; <args>; NOP...; STORE_FAST param_n ... param_0; JUMP_BACKWARD <start>
+    with keyword arguments (KW_NAMES) stored into the parameters they name.
+    Every instruction keeps its size, so the line and exception tables stay
+    valid. Returns the new code object, or None if no tail call was rewritten.
+    """
+    code = func.__code__
+    argc = code.co_argcount
+    if (not _BYTECODE_REWRITE or code.co_flags & _UNSUPPORTED_FLAGS or code.co_kwonlyargcount
+            or code.co_cellvars or code.co_freevars or argc > 255):
+        return None
+    
+    instrs = list(dis.get_instructions(code))
+    # Byte offset where each instruction, including its inline caches, ends
+    ends = [instr.offset for instr in instrs[1:]] + [len(code.co_code)]
+    top_idx = 1 if instrs[0].opname == 'RESUME' else 0
+    top = instrs[top_idx].offset
+    co_code = bytearray(code.co_code)
+    
+    rewritten = False
+    for idx in range(top_idx + 2, len(instrs)):
+        if instrs[idx].opname != 'RETURN_VALUE':
+            continue
+        call_idx = idx - 1
+        if instrs[call_idx].opname != 'CALL' or instrs[call_idx].arg != argc:
+            continue
+        first = call_idx - 1 if instrs[call_idx - 1].opname == 'PRECALL' else call_idx
+        # Keyword arguments are the last values on the stack, named by KW_NAMES
+        kw_names = ()
+        if instrs[first - 1].opname == 'KW_NAMES':
+            first -= 1
+            kw_names = code.co_consts[instrs[first].arg]
+        targets = list(range(argc - len(kw_names)))
+        targets += [code.co_varnames.index(name) for name in kw_names if name in code.co_varnames[:argc]]
+        if sorted(targets) != list(range(argc)):
+            continue  # Unknown or repeated parameter, let the call raise
+        
+        # Walk back over the argument expressions to the LOAD_GLOBAL of the callee
+        load_idx = None
+        depth = 0
+        for j in range(first - 1, top_idx - 1, -1):
+            instr = instrs[j]
+            if (instr.opname == 'LOAD_GLOBAL' and instr.argval == func.__name__
+                    and instr.arg & 1 and depth == argc):
+                load_idx = j
+                break
+            if instr.opcode in _JUMP_OPS or instr.opname == 'EXTENDED_ARG':
+                break  # Branching argument expressions are not handled
+            depth += dis.stack_effect(instr.opcode, instr.arg, jump=False)
+        if load_idx is None:
+            continue
+        if any(instr.is_jump_target for instr in instrs[load_idx + 1:idx + 1]):
+            continue
+        
+        region_start, region_end = instrs[first].offset, ends[idx]
+        units = (region_end - region_start) // 2
+        distance = (region_end - top) // 2
+        if units < argc + 1 or distance > 255:
+            continue
+        ops = [_NOP, 0] * (units - argc - 1)
+        for param in reversed(targets):
+            ops += [_STORE_FAST, param]
+        ops += [_JUMP_BACKWARD, distance]
+        co_code[region_start:region_end] = bytes(ops)
+        load_start = instrs[load_idx].offset
+        co_code[load_start:ends[load_idx]] = bytes([_NOP, 0]) * ((ends[load_idx] - load_start) // 2)
+        rewritten = True
+    
+    if not rewritten:
+        return None
+    return code.replace(co_code=bytes(co_code))
+
+def _untransformed(func):
+    log.debug("tail_recursive: %s left unchanged", func.__qualname__)
+    if os.environ.get("TAIL_RECURSIVE_WARN"):
+        warnings.warn(f"tail_recursive: {func.__qualname__} does not match a supported "
+                      "tail-recursion pattern and was left unchanged", stacklevel=3)
+    return func
 
 def tail_recursive(func):
     """
@@ -241,22 +411,57 @@ def tail_recursive(func):
                 return acc
             return factorial(n - 1, acc * n)
     """
-    source = inspect.getsource(func)
-    # dedent in case the function is indented (e.g. in a class or nested function)
-    # print(*source)
-    source = "\n".join(str(textwrap.dedent(source)).split("\n")[1:])
+    # Fast path: rewrite the bytecode in place, falling back to the AST transform
+    new_code = _rewrite_tail_calls_bytecode(func)
+    if new_code is not None:
+        log.debug("tail_recursive: rewrote %s in bytecode", func.__qualname__)
+        new_func = types.FunctionType(new_code, func.__globals__, func.__name__,
+                                      func.__defaults__, func.__closure__)
+        new_func.__kwdefaults__ = func.__kwdefaults__
+        new_func.__doc__ = func.__doc__
+        return new_func
 
-    tree = ast.parse(source)
-    transformer = TailRecursionTransformer(func.__name__)
-    transformed_tree = transformer.visit(tree)
-    ast.fix_missing_locations(transformed_tree)
-    
-    code_obj = compile(transformed_tree, filename="<ast>", mode="exec")
+    code = func.__code__
+    if code.co_freevars:
+        # Re-executing the def at module scope would lose the closure cells
+        return _untransformed(func)
+    # Filename rather than module, so two __main__ scripts never share entries
+    cache_key = (code.co_filename, code.co_firstlineno, func.__qualname__, code.co_code)
+    new_code = _TRANSFORM_CACHE.get(cache_key)
+    if new_code is None:
+        log.debug("tail_recursive: transforming %s from source", func.__qualname__)
+        source = inspect.getsource(func)
+        # dedent in case the function is indented (e.g. in a class or nested function)
+        source = "\n".join(str(textwrap.dedent(source)).split("\n")[1:])
+
+        tree = ast.parse(source)
+        if not tree.body or not isinstance(tree.body[0], ast.FunctionDef):
+            return _untransformed(func)
+        func_node = tree.body[0]
+        # Cheap structural check: without a leading if/match, no pattern can match
+        if not any(isinstance(stmt, (ast.If, ast.Match)) for stmt in func_node.body[:3]):
+            return _untransformed(func)
 
-    # We'll run the code in the original function's globals, so it can reference the same environment
-    namespace = {}
-    exec(code_obj, func.__globals__, namespace)
-    new_func = namespace[func.__name__]
+        transformer = TailRecursionTransformer(func.__name__)
+        transformed_tree = transformer.visit(tree)
+        if not transformer.transformed:
+            return _untransformed(func)  # Nothing to gain
+        ast.fix_missing_locations(transformed_tree)
+        
+        code_obj = compile(transformed_tree, filename="<ast>", mode="exec")
+
+        # We'll run the code in the original function's globals, so it can reference the same environment
+        namespace = {}
+        exec(code_obj, func.__globals__, namespace)
+        new_code = namespace[func.__name__].__code__
+        _TRANSFORM_CACHE[cache_key] = new_code
+    else:
+        log.debug("tail_recursive: reusing cached code for %s", func.__qualname__)
+
+    # Build the function from the (possibly cached) code, reusing the original defaults
+    new_func = types.FunctionType(new_code, func.__globals__, func.__name__,
+                                  func.__defaults__)
+    new_func.__kwdefaults__ = func.__kwdefaults__
     
     # Preserve metadata
     new_func.__doc__ = func.__doc__
@@ -282,6 +487,14 @@ def factorial_if(n, acc=1):
         return acc
     return factorial_if(n - 1, acc * n)
 
+# Example 3: tail call passing its arguments by keyword
+@tail_recursive
+def sum_to(n, acc=0):
+    """Tail-recursive sum of 1..n, arguments given out of order."""
+    if n == 0:
+        return acc
+    return sum_to(acc=acc + n, n=n - 1)
+
 # -----------------------------
 # DEMO USAGE (Python 3.10+)
 # -----------------------------
@@ -292,3 +505,4 @@ if __name__ == "__main__":
     # Check large input doesn't cause recursion error
     print("factorial_match(1000) =", factorial_match(1000))
     print("factorial_if(1000) =", factorial_if(1000))
+    print("sum_to(100) =", sum_to(100))  # 5050
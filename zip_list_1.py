@@ -1,6 +1,50 @@
+import functools
+import itertools
+import math
+import operator
 from typing import List, Tuple, Any
 
-def recursive_zip(list1: List, list2: List, shape: Tuple[int, ...]) -> List:
+from zip_list_codegen import zip_with_shape, is_sequence, numpy_zip
+
+def recursive_zip(list1: List, list2: List, shape: Tuple[int, ...], strict: bool = False) -> List:
+    """
+    Zip two lists according to a shape tuple.
+    
+    NumPy arrays of the given shape are zipped in one vectorized pass. Other
+    inputs (nested lists or tuples) go through a function generated and
+    compiled once per shape, and the recursive implementation remains the
+    fallback.
+    
+    Args:
+        list1: First list to zip
+        list2: Second list to zip
+        shape: Tuple describing the expected shape of the input lists
+        strict: Check every sublist in the fallback path, not just the first
+            one at each level
+        
+    Returns:
+        List: Recursively zipped lists according to the shape
+        
+    Raises:
+        ValueError: If the lists don't match the expected shape
+    """
+    result = numpy_zip(list1, list2, shape)
+    if result is not None:
+        return result
+    
+    # 0-D and 1-D shapes are a single builtin zip, mismatches fall through
+    # to the regular path, which reports them
+    if len(shape) <= 1 and is_sequence(list1) and is_sequence(list2):
+        if not shape or len(list1) == shape[0] == len(list2):
+            return list(zip(list1, list2))
+    
+    # Specialized zip first, the recursive path covers the shapes it rejects
+    result = zip_with_shape(list1, list2, shape, lambda: _shape_error(list1, list2, shape))
+    if result is not None:
+        return result
+    return _recursive_zip(list1, list2, shape, strict)
+
+def _recursive_zip(list1: List, list2: List, shape: Tuple[int, ...], strict: bool = False) -> List:
     """
     Recursively zip two lists according to a shape tuple.
     
@@ -8,6 +52,8 @@ def recursive_zip(list1: List, list2: List, shape: Tuple[int, ...]) -> List:
         list1: First list to zip
         list2: Second list to zip
         shape: Tuple describing the expected shape of the input lists
+        strict: Validate every sublist instead of following only the first one
+            at each level
         
     Returns:
         List: Recursively zipped lists according to the shape
@@ -16,7 +62,19 @@ def recursive_zip(list1: List, list2: List, shape: Tuple[int, ...]) -> List:
         ValueError: If the lists don't match the expected shape
     """
     def validate_shape(lst: List, expected_shape: Tuple[int, ...]) -> bool:
-        if not isinstance(lst, list):
+        # For rectangular input the shape of the first spine is the shape
+        if strict:
+            return validate_shape_strict(lst, expected_shape)
+        if not is_sequence(lst):
+            return False
+        expected_shape = tuple(expected_shape)
+        actual_shape = _get_actual_shape(lst)[:len(expected_shape)]
+        # The spine stops early at an empty list, which matches any deeper dims
+        return actual_shape == expected_shape[:len(actual_shape)] and (
+            len(actual_shape) == len(expected_shape) or actual_shape[-1] == 0)
+    
+    def validate_shape_strict(lst: List, expected_shape: Tuple[int, ...]) -> bool:
+        if not is_sequence(lst):
             return False
         
         if not expected_shape:
@@ -28,33 +86,51 @@ def recursive_zip(list1: List, list2: List, shape: Tuple[int, ...]) -> List:
         if len(expected_shape) == 1:
             return True
             
-        return all(validate_shape(item, expected_shape[1:]) for item in lst)
-    
-    def get_actual_shape(lst: List) -> Tuple[int, ...]:
-        if not isinstance(lst, list):
-            return tuple()
-        if not lst:
-            return (0,)
-        return (len(lst),) + get_actual_shape(lst[0])
+        return all(validate_shape_strict(item, expected_shape[1:]) for item in lst)
     
     # Validate input shapes
     if not validate_shape(list1, shape) or not validate_shape(list2, shape):
-        actual_shape1 = get_actual_shape(list1)
-        actual_shape2 = get_actual_shape(list2)
-        raise ValueError(
-            f"Lists don't match expected shape {shape}. "
-            f"Actual shapes: list1{actual_shape1}, list2{actual_shape2}"
-        )
+        raise _shape_error(list1, list2, shape)
     
+    # Validated once above, the recursion itself does no more checks
+    return _zip_unchecked(list1, list2, tuple(shape))
+
+def _get_actual_shape(lst: List) -> Tuple[int, ...]:
+    shape_list = []
+    current = lst
+    while is_sequence(current):
+        shape_list.append(len(current))
+        if not shape_list[-1]:
+            break
+        current = current[0]
+    return tuple(shape_list)
+
+def _shape_error(list1: List, list2: List, shape: Tuple[int, ...]) -> ValueError:
+    return ValueError(
+        f"Lists don't match expected shape {shape}. "
+        f"Actual shapes: list1{_get_actual_shape(list1)}, list2{_get_actual_shape(list2)}"
+    )
+
+def _zip_unchecked(list1: List, list2: List, shape: Tuple[int, ...]) -> List:
     # Base case: if shape is empty or has only one dimension
-    if not shape or len(shape) == 1:
+    if len(shape) <= 1:
         return list(zip(list1, list2))
     
-    # Recursive case: zip current level and apply to all sublists
-    return [
-        recursive_zip(l1, l2, shape[1:])
-        for l1, l2 in zip(list1, list2)
+    # Walk the outer index tuples instead of recursing, one leaf zip per tuple
+    # in row-major order, each sublist reached with a single reduce(getitem)
+    outer_shape = shape[:-1]
+    leaves = [
+        list(zip(functools.reduce(operator.getitem, idx, list1),
+                 functools.reduce(operator.getitem, idx, list2)))
+        for idx in itertools.product(*map(range, outer_shape))
     ]
+    
+    # Regroup the flat leaves by the outer dimensions
+    result = leaves
+    for k in range(len(outer_shape) - 1, 0, -1):
+        size = outer_shape[k]
+        result = [result[i * size:(i + 1) * size] for i in range(math.prod(outer_shape[:k]))]
+    return result
 
 
 # Simple 2D example
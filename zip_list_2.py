@@ -1,5 +1,7 @@
+import math
 from typing import List, Tuple, Any
-from collections import deque
+
+from zip_list_codegen import zip_with_shape, is_sequence, numpy_zip
 
 def iterative_zip(list1: List, list2: List, shape: Tuple[int, ...]) -> List:
     """
@@ -16,67 +18,88 @@ def iterative_zip(list1: List, list2: List, shape: Tuple[int, ...]) -> List:
     Raises:
         ValueError: If the lists don't match the expected shape
     """
-    def validate_shape(lst: List, expected_shape: Tuple[int, ...]) -> bool:
-        current = lst
-        for dim in expected_shape:
-            if not isinstance(current, list) or len(current) != dim:
-                return False
-            if current:
-                current = current[0]
-        return True
+    # NumPy arrays of the given shape are paired in one vectorized pass, first
+    # so their leaves are Python scalars whatever the number of dimensions
+    result = numpy_zip(list1, list2, shape)
+    if result is not None:
+        return result
+    
+    # 0-D and 1-D shapes are a single builtin zip, mismatches fall through
+    # to the regular path, which reports them
+    if len(shape) <= 1 and is_sequence(list1) and is_sequence(list2):
+        if not shape or len(list1) == shape[0] == len(list2):
+            return list(zip(list1, list2))
     
     def get_actual_shape(lst: List) -> Tuple[int, ...]:
         shape_list = []
         current = lst
-        while isinstance(current, list):
+        while is_sequence(current):
             shape_list.append(len(current))
-            if not current:
+            if not shape_list[-1]:
                 break
             current = current[0]
         return tuple(shape_list)
     
-    # Validate input shapes
-    if not validate_shape(list1, shape) or not validate_shape(list2, shape):
+    def shape_error() -> ValueError:
         actual_shape1 = get_actual_shape(list1)
         actual_shape2 = get_actual_shape(list2)
-        raise ValueError(
+        return ValueError(
             f"Lists don't match expected shape {shape}. "
             f"Actual shapes: list1{actual_shape1}, list2{actual_shape2}"
         )
     
     if not shape:
+        if not is_sequence(list1) or not is_sequence(list2):
+            raise shape_error()
         return list(zip(list1, list2))
     
-    # Initialize result with the same structure
-    result = []
+    # Straight-line zip generated and compiled once per shape, the traversal
+    # below covers the shapes it rejects
+    result = zip_with_shape(list1, list2, shape, shape_error)
+    if result is not None:
+        return result
     
-    # Use a queue to keep track of the current position in each list
-    # Each queue item is (list1_part, list2_part, current_depth, parent_list, index_in_parent)
-    queue = deque([(list1, list2, 0, None, None)])
+    # Leaf zips are stored flat in row-major order and nested once at the end,
+    # so no intermediate lists or parent back-pointers are needed
+    outer_shape = tuple(shape[:-1])
+    leaves = [None] * math.prod(outer_shape)
     
-    while queue:
-        l1, l2, depth, parent, idx = queue.popleft()
+    # Use a stack to keep track of the current position in each list. The
+    # result is written by position, so the traversal order does not matter.
+    # Each stack item is (list1_part, list2_part, current_depth, flat_offset)
+    stack = [(list1, list2, 0, 0)]
+    
+    # Loop invariants and builtins bound to locals for the hot loop
+    shape_local = tuple(shape)
+    last = len(shape_local) - 1
+    pop, push = stack.pop, stack.append
+    _zip, _list, _range, _isinstance, _is_sequence, _len = zip, list, range, isinstance, is_sequence, len
+    
+    while stack:
+        l1, l2, depth, offset = pop()
+        
+        # Validate each sublist as it is reached, in the same single pass
+        dim = shape_local[depth]
+        # Lists are checked first as the fast case, any other sized non-string also counts
+        if (not (_isinstance(l1, list) or _is_sequence(l1)) or not (_isinstance(l2, list) or _is_sequence(l2))
+                or _len(l1) != dim or _len(l2) != dim):
+            raise shape_error()
         
         # If we're at the last dimension, zip the current lists
-        if depth == len(shape) - 1:
-            current_result = list(zip(l1, l2))
-            if parent is None:
-                result = current_result
-            else:
-                parent[idx] = current_result
+        if depth == last:
+            leaves[offset] = _list(_zip(l1, l2))
         else:
-            # Create a new list for this level
-            current_result = [[] for _ in range(shape[depth])]
-            if parent is None:
-                result = current_result
-            else:
-                parent[idx] = current_result
-                
-            # Add sublists to the queue
-            for i in range(shape[depth]):
-                queue.append((l1[i], l2[i], depth + 1, current_result, i))
+            # Add sublists to the stack, offsets follow the row-major layout
+            base = offset * dim
+            for i in _range(dim):
+                push((l1[i], l2[i], depth + 1, base + i))
     
-    return result
+    # Regroup the flat leaves by the outer dimensions
+    result = leaves
+    for k in range(len(outer_shape) - 1, 0, -1):
+        size = outer_shape[k]
+        result = [result[i * size:(i + 1) * size] for i in range(math.prod(outer_shape[:k]))]
+    return result[0] if not outer_shape else result
 
 # 2D example
 list1 = [[1, 2], [3, 4]]
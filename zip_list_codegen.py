@@ -0,0 +1,130 @@
+import functools
+import math
+import sys
+from collections.abc import Sequence
+from typing import Callable, Tuple
+
+# Deeper shapes would exceed CPython's limit on nested blocks
+MAX_SPECIALIZED_DIMS = 8
+# Innermost zips up to this many leaves in total are emitted as literal tuples
+UNROLL_LIMIT = 64
+
+def is_sequence(obj) -> bool:
+    """
+    Ordered, indexable containers count as a level, so tuples and arrays work
+    too. Strings, sets, dicts and 0-D arrays (whose len() raises) do not.
+    """
+    if isinstance(obj, (list, tuple)):
+        return True
+    if isinstance(obj, (str, bytes, bytearray)):
+        return False
+    if isinstance(obj, Sequence):
+        return True
+    # NumPy arrays are not registered as a Sequence
+    return getattr(obj, 'ndim', 0) > 0 and hasattr(obj, '__getitem__') and hasattr(obj, '__len__')
+
+@functools.lru_cache(maxsize=128)
+def compile_zipper(shape: Tuple[int, ...]) -> Callable:
+    """
+    Generate and compile a zip function specialized for one shape.
+
+    The dimensions are baked in as literals, so the generated code has no depth
+    counter, no queue and no shape indexing. Each level still checks that both
+    sides are sequences (lists first, as the fast case) of the expected length
+    and otherwise raises the exception returned by fail().
+    For shape (2, 3) this produces:
+
+        def zipper(l1, l2, fail):
+            if not ((isinstance(l1, list) or is_sequence(l1)) and (isinstance(l2, list) or is_sequence(l2))
+                    and len(l1) == 2 and len(l2) == 2):
+                raise fail()
+            r0 = []
+            for a0, b0 in zip(l1, l2):
+                if not ((isinstance(a0, list) or is_sequence(a0)) and (isinstance(b0, list) or is_sequence(b0))
+                        and len(a0) == 3 and len(b0) == 3):
+                    raise fail()
+                r0.append([(a0[0], b0[0]), (a0[1], b0[1]), (a0[2], b0[2])])
+            return r0
+
+    Args:
+        shape: Tuple describing the expected shape, with at least one dimension
+
+    Returns:
+        Callable: zipper(list1, list2, fail) returning the zipped lists, where
+        fail() builds the exception to raise on a shape mismatch
+    """
+    def check(a, b, dim, indent):
+        return [f"{indent}if not ((isinstance({a}, list) or is_sequence({a})) "
+                f"and (isinstance({b}, list) or is_sequence({b})) "
+                f"and len({a}) == {dim} and len({b}) == {dim}):",
+                f"{indent}    raise fail()"]
+
+    def leaf(a, b, dim):
+        # Fully unroll the innermost level for small shapes
+        if math.prod(shape) <= UNROLL_LIMIT:
+            return "[" + ", ".join(f"({a}[{k}], {b}[{k}])" for k in range(dim)) + "]"
+        return f"list(zip({a}, {b}))"
+
+    lines = ["def zipper(l1, l2, fail):"]
+    lines += check("l1", "l2", shape[0], "    ")
+    if len(shape) == 1:
+        lines.append(f"    return {leaf('l1', 'l2', shape[0])}")
+    else:
+        a, b, indent = "l1", "l2", "    "
+        for depth, dim in enumerate(shape[1:]):
+            lines.append(f"{indent}r{depth} = []")
+            lines.append(f"{indent}for a{depth}, b{depth} in zip({a}, {b}):")
+            a, b, indent = f"a{depth}", f"b{depth}", indent + "    "
+            lines += check(a, b, dim, indent)
+        last = len(shape) - 2
+        lines.append(f"{indent}r{last}.append({leaf(a, b, shape[-1])})")
+        for depth in range(last, 0, -1):
+            indent = indent[:-4]
+            lines.append(f"{indent}r{depth - 1}.append(r{depth})")
+        lines.append("    return r0")
+
+    namespace = {"is_sequence": is_sequence}
+    exec(compile("\n".join(lines), f"<zipper {shape}>", "exec"), namespace)
+    return namespace["zipper"]
+
+def zip_with_shape(list1, list2, shape, fail):
+    """
+    Zip through the specialized function for shape, or return None if the
+    shape cannot be specialized (empty, too deep or not hashable).
+    
+    Callers try this before their own traversal, which measured slower for
+    every shape it could specialize (most of all for deep ones), so the
+    traversal only runs for shapes this rejects. fail() must return the
+    exception to raise on a shape mismatch.
+    """
+    if not shape or len(shape) > MAX_SPECIALIZED_DIMS:
+        return None
+    try:
+        zipper = compile_zipper(tuple(shape))
+    except TypeError:
+        return None  # Unhashable or non-integer dimensions
+    return zipper(list1, list2, fail)
+
+def numpy_zip(list1, list2, shape):
+    """
+    Vectorized zip for NumPy arrays, None when it does not apply.
+    
+    Shape validation becomes a single comparison of the array shapes, and the
+    leaves are paired from two flat lists before being regrouped by shape.
+    Lists are never converted, building the arrays costs more than the pure
+    Python zip saves.
+    """
+    # Arrays can only exist once NumPy is imported, so never import it here
+    np = sys.modules.get("numpy")
+    if np is None or not shape or not (isinstance(list1, np.ndarray) and isinstance(list2, np.ndarray)):
+        return None
+    shape = tuple(shape)
+    a, b = list1, list2
+    if a.shape != shape or b.shape != shape:
+        return None
+    
+    nested = list(zip(a.ravel().tolist(), b.ravel().tolist()))
+    for k in range(len(shape) - 1, 0, -1):
+        size = shape[k]
+        nested = [nested[i * size:(i + 1) * size] for i in range(math.prod(shape[:k]))]
+    return nested